@@ -0,0 +1,70 @@
+"""JSON file vs SQLite database: startup, lookup and save
+
+    $ python3 -m benchmarks.bench_backends [amount]
+"""
+
+from pathlib import Path
+import random
+import sys
+import tempfile
+from time import perf_counter
+
+from benchmarks.fakebook import fake_phone, fake_records
+from notabene.addressbook import AddressBook
+from notabene.main import load_addressbook
+from notabene.phone import Phone
+from notabene.sqlitestorage import SqliteStorage
+from notabene.storage import JsonStorage
+
+LOOKUPS = 100
+
+
+def bench_storage(storage_class, pathfile: Path, amount: int) -> dict:
+    result = {}
+    # Create storage with amount records
+    storage = storage_class(pathfile)
+    start = perf_counter()
+    ab = AddressBook(fake_records(amount), backend=storage.create_backend())
+    if isinstance(storage, JsonStorage):
+        storage.compact(ab)
+    else:
+        storage.save(ab)
+    result["create"] = perf_counter() - start
+    names = list(ab.keys())
+    del ab
+
+    start = perf_counter()
+    storage = storage_class(pathfile)
+    ab = load_addressbook(storage)
+    result["startup"] = perf_counter() - start
+
+    rnd = random.Random(1)
+    samples = [rnd.choice(names).split(' ')[0] for __ in range(LOOKUPS)]
+    phones = [Phone(fake_phone(rnd)[-7:]) for __ in range(LOOKUPS)]
+    start = perf_counter()
+    for sample in samples:
+        ab.get_similar(sample)
+    for phone in phones:
+        ab.get_similar_by_phone(phone)
+    result["lookup"] = (perf_counter() - start) / (2 * LOOKUPS)
+
+    start = perf_counter()
+    ab[names[0]].change("Phone", "+38 (099) 730-99-90")
+    storage.save(ab)
+    result["save"] = perf_counter() - start
+    return result
+
+
+if __name__ == "__main__":
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for (title, storage_class, filename) in (
+                ("JSON", JsonStorage, "bench.abo"),
+                ("SQLite", SqliteStorage, "bench.db")):
+            result = bench_storage(storage_class, Path(tmpdir) / filename,
+                                   amount)
+            print(f"{title:>6}: {amount} records: "
+                  f"create {result['create']:.2f} s, "
+                  f"startup {result['startup']:.3f} s, "
+                  f"lookup {result['lookup'] * 1e3:.2f} ms, "
+                  f"save {result['save'] * 1e3:.1f} ms")
@@ -0,0 +1,77 @@
+"""Days left to birthday: one by one vs bulk, and report of all records
+
+    $ python3 -m benchmarks.bench_birthdays [amount]
+"""
+
+from array import array
+from datetime import date, datetime, timedelta
+import random
+import sys
+from time import perf_counter
+
+from benchmarks.fakebook import fake_names
+import notabene.birthday
+from notabene.addressbook import AddressBook
+from notabene.birthday import Birthday, bulk_days_to_day
+
+
+def days_by_strptime(birthday: Birthday, today: date) -> int:
+    """Algorithm of days_to_birthday() before parsed day of year"""
+    bday = datetime.strptime(birthday.value, "%d.%m.%Y").date()
+    bday = bday.replace(year=today.year)
+    if today > bday:
+        bday = bday.replace(year=today.year + 1)
+    return (bday - today).days
+
+
+def fake_birthdays(amount: int, seed=1) -> list:
+    rnd = random.Random(seed)
+    birthdays = []
+    while len(birthdays) < amount:
+        bday = date(2001, 1, 1) - timedelta(days=rnd.randint(0, 18250))
+        # 29 February is skipped to compare with days_by_strptime()
+        if bday.month != 2 or bday.day != 29:
+            birthdays.append(Birthday(bday.strftime("%d.%m.%Y")))
+    return birthdays
+
+
+def bench(amount: int) -> dict:
+    today = date.today()
+    birthdays = fake_birthdays(amount)
+    result = {}
+
+    start = perf_counter()
+    expected = [days_by_strptime(birthday, today) for birthday in birthdays]
+    result["strptime"] = perf_counter() - start
+
+    start = perf_counter()
+    by_one = [birthday.days_to_birthday(today) for birthday in birthdays]
+    result["by_one"] = perf_counter() - start
+
+    numpy = notabene.birthday.numpy
+    for (mode, module) in (("bulk_python", None), ("bulk_numpy", numpy)):
+        if mode == "bulk_numpy" and numpy is None:
+            continue
+        notabene.birthday.numpy = module
+        start = perf_counter()
+        days = array("H", (birthday.day for birthday in birthdays))
+        bulk = bulk_days_to_day(days, today)
+        result[mode] = perf_counter() - start
+        assert bulk == expected == by_one
+    notabene.birthday.numpy = numpy
+
+    ab = AddressBook((name, ("Birthday", str(birthday)))
+                     for (name, birthday)
+                     in zip(fake_names(amount), birthdays))
+    start = perf_counter()
+    ab.report()
+    result["report"] = perf_counter() - start
+    return result
+
+
+if __name__ == "__main__":
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    result = bench(amount)
+    print(f"{amount} birthdays:")
+    for (mode, seconds) in result.items():
+        print(f"  {mode:12} {seconds * 1e3:8.1f} ms")
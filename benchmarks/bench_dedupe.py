@@ -0,0 +1,56 @@
+"""Search of duplicates in the whole book with blocking
+
+    $ python3 -m benchmarks.bench_dedupe [amount]
+
+Each 100th record gets a duplicate: the same words of name in other
+order or the name with a typo and the same phone.
+"""
+
+import random
+import sys
+from time import perf_counter
+
+from benchmarks.fakebook import fake_records
+from notabene.addressbook import AddressBook
+
+
+def book_with_duplicates(amount: int, seed=1) -> tuple:
+    """(records, {duplicate name: original name})"""
+    rnd = random.Random(seed)
+    records = list(fake_records(amount, seed))
+    names = set(record[0] for record in records)
+    duplicates = {}
+    for record in records[::100]:
+        words = record[0].split(" ")
+        if rnd.randint(0, 1):
+            name = " ".join(words[1:] + words[:1])
+        else:
+            word = words[-1]
+            i = rnd.randrange(1, len(word))
+            words[-1] = word[:i] + "о" + word[i + 1:]
+            name = " ".join(words)
+        if name not in names:
+            names.add(name)
+            duplicates[name] = record[0]
+            records.append((name,) + record[1:])
+    return (records, duplicates)
+
+
+def bench(amount: int) -> dict:
+    (records, duplicates) = book_with_duplicates(amount)
+    ab = AddressBook(records)
+    start = perf_counter()
+    groups = ab.find_duplicates()
+    result = {"find": perf_counter() - start, "groups": len(groups)}
+    group_of = dict((name, group) for group in groups for name in group)
+    result["recall"] = sum(
+        original in group_of.get(name, ())
+        for (name, original) in duplicates.items()) / len(duplicates)
+    return result
+
+
+if __name__ == "__main__":
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    result = bench(amount)
+    print(f"{amount} records: {result['find']:.2f} s, "
+          f"{result['groups']} groups, recall {result['recall']:.3f}")
@@ -0,0 +1,73 @@
+"""Search of names with typos: deletion index vs full scan
+
+    $ python3 -m benchmarks.bench_fuzzy [amount] [queries]
+"""
+
+import random
+import sys
+from time import perf_counter
+
+from benchmarks.fakebook import fake_names
+from notabene.addressbook import AddressBook
+from notabene.fuzzyindex import FuzzyIndex
+from notabene.nameindex import NameIndex
+
+
+def typo(word: str, rnd: random.Random) -> str:
+    """Word with one random substitution, deletion or transposition"""
+    i = rnd.randrange(len(word) - 1)
+    kind = rnd.randint(0, 2)
+    if kind == 0:
+        return word[:i] + "о" + word[i + 1:]
+    if kind == 1:
+        return word[:i] + word[i + 1:]
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def full_scan(ab: AddressBook, name: str) -> set:
+    words = set(NameIndex.split(name))
+    return set(key for key in ab.keys()
+               if all(min(FuzzyIndex.distance(word, token, 1)
+                          for token in NameIndex.split(key)) <= 1
+                      for word in words))
+
+
+def bench(amount: int, queries: int) -> dict:
+    rnd = random.Random(1)
+    names = fake_names(amount)
+    result = {}
+
+    start = perf_counter()
+    ab = AddressBook([(name,) for name in names])
+    result["build"] = perf_counter() - start
+    result["deletions"] = len(ab.backend.name_index.fuzzy.deletions)
+
+    samples = [" ".join(typo(word, rnd) for word in name.split(" ")[:2])
+               for name in rnd.sample(names, queries)]
+    start = perf_counter()
+    found = [ab.get_fuzzy(sample) for sample in samples]
+    result["lookup"] = (perf_counter() - start) / queries
+    result["found"] = sum(map(len, found)) / queries
+
+    start = perf_counter()
+    assert full_scan(ab, samples[0]) == set(found[0])
+    result["full_scan"] = perf_counter() - start
+
+    # Incremental update: rename of one record
+    start = perf_counter()
+    for name in names[:queries]:
+        ab.rename(name, name + "ко")
+    result["rename"] = (perf_counter() - start) / queries
+    return result
+
+
+if __name__ == "__main__":
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    result = bench(amount, queries)
+    print(f"{amount} names, {result['deletions']} deletions, "
+          f"build {result['build']:.2f} s")
+    print(f"  lookup    {result['lookup'] * 1e3:8.3f} ms "
+          f"({result['found']:.1f} names found)")
+    print(f"  full scan {result['full_scan'] * 1e3:8.1f} ms")
+    print(f"  rename    {result['rename'] * 1e3:8.3f} ms")
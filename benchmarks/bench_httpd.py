@@ -0,0 +1,79 @@
+"""Load test of web frontend: requests/sec and latency of static files
+
+    $ python3 -m benchmarks.bench_httpd [clients] [requests_per_client]
+
+Server runs in a separate process. Each client keeps one connection
+alive and requests web files, half of them with If-None-Match.
+"""
+
+import http.client
+import multiprocessing
+import sys
+import threading
+from time import perf_counter
+
+from notabene.addressbook import AddressBook
+from notabene.main import create_httpd
+from notabene.selection import Selection
+
+PATHS = ("/", "/jquery.min.js", "/tag-cloud.min.js", "/favicon.ico")
+
+
+def serve(port_queue):
+    def box(): pass
+    box.ab = AddressBook()
+    box.ab_fit = Selection(box.ab.keys())
+    box.ab_fit_to_fit = box.ab_fit
+    httpd = create_httpd(box, port=0)
+    port_queue.put(httpd.server_address[1])
+    httpd.serve_forever()
+
+
+def client(port: int, amount: int, latencies: list):
+    connection = http.client.HTTPConnection("localhost", port)
+    etags = {}
+    for i in range(amount):
+        path = PATHS[i % len(PATHS)]
+        headers = {}
+        if i % 2 and path in etags:
+            headers["If-None-Match"] = etags[path]
+        start = perf_counter()
+        connection.request("GET", path, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        latencies.append(perf_counter() - start)
+        assert response.status in (200, 304), response.status
+        etags[path] = response.getheader("ETag")
+    connection.close()
+
+
+def bench(clients: int, amount: int) -> dict:
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(port_queue,),
+                                     daemon=True)
+    server.start()
+    port = port_queue.get()
+    latencies = []
+    threads = [threading.Thread(target=client, args=(port, amount, latencies))
+               for __ in range(clients)]
+    start = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = perf_counter() - start
+    server.terminate()
+    latencies.sort()
+    return {"requests": len(latencies),
+            "rps": len(latencies) / elapsed,
+            "p50": latencies[len(latencies) // 2],
+            "p99": latencies[int(len(latencies) * 0.99)]}
+
+
+if __name__ == "__main__":
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    amount = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    result = bench(clients, amount)
+    print(f"{result['requests']} requests by {clients} clients: "
+          f"{result['rps']:.0f} requests/sec, "
+          f"p50 {result['p50'] * 1e3:.2f} ms, p99 {result['p99'] * 1e3:.2f} ms")
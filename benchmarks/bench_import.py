@@ -0,0 +1,55 @@
+"""Bulk import of CSV file: one process vs process pool
+
+    $ python3 -m benchmarks.bench_import [amount]
+"""
+
+import csv
+import os
+from pathlib import Path
+import sys
+import tempfile
+from time import perf_counter
+
+from benchmarks.fakebook import fake_records
+from notabene.addressbook import AddressBook
+from notabene.importer import iter_file
+
+
+def write_csv(pathfile: Path, amount: int):
+    with open(pathfile, "w", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(("Name", "Phone", "Phone", "Phone", "Birthday",
+                         "Address"))
+        for record in fake_records(amount):
+            fields = dict.fromkeys(("Phone1", "Phone2", "Phone3",
+                                    "Birthday", "Address"), "")
+            phones = [value for (title, value) in record[1:]
+                      if title == "Phone"]
+            for (i, phone) in enumerate(phones, 1):
+                fields[f"Phone{i}"] = phone
+            fields.update((title, value) for (title, value) in record[1:]
+                          if title != "Phone")
+            writer.writerow((record[0],) + tuple(fields.values()))
+
+
+def bench(amount: int) -> dict:
+    result = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pathfile = Path(tmpdir) / "bench.csv"
+        write_csv(pathfile, amount)
+        for workers in sorted({1, os.cpu_count() or 1}):
+            ab = AddressBook()
+            start = perf_counter()
+            (names, errors) = ab.bulk_import(iter_file(pathfile),
+                                             workers=workers)
+            result[workers] = perf_counter() - start
+            # Fake names can be equal by combination of words
+            assert len(names) + len(errors) == amount
+    return result
+
+
+if __name__ == "__main__":
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for (workers, seconds) in bench(amount).items():
+        print(f"{amount} rows, {workers} process(es): {seconds:.2f} s, "
+              f"{amount / seconds:.0f} rows/sec")
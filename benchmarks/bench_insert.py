@@ -0,0 +1,33 @@
+"""Bulk insert of names the way cmd_add does it
+
+Uniqueness check is_any_equal_by_combination() + insert. Time per
+name must stay constant when amount of names grows.
+
+    $ python3 -m benchmarks.bench_insert [max_amount]
+"""
+
+import sys
+from time import perf_counter
+
+from benchmarks.fakebook import fake_names
+from notabene.addressbook import AddressBook
+
+
+def bench(amount: int) -> float:
+    names = fake_names(amount)
+    ab = AddressBook()
+    start = perf_counter()
+    for name in names:
+        if not ab.is_any_equal_by_combination(name):
+            ab[name] = ()
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    max_amount = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    amount = max_amount // 8
+    while amount <= max_amount:
+        elapsed = bench(amount)
+        print(f"{amount:>8} names: {elapsed:8.3f} s "
+              f"{elapsed / amount * 1e6:8.2f} us/name")
+        amount *= 2
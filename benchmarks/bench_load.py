@@ -0,0 +1,53 @@
+"""Address book startup: streaming load of .abo file
+
+Startup is timed for the file written by application (trusted, no
+validation) and for the old format file (full validation).
+
+    $ python3 -m benchmarks.bench_load [amount]
+"""
+
+import json
+from pathlib import Path
+import sys
+import tempfile
+from time import perf_counter
+
+from benchmarks.fakebook import fake_records
+from notabene import main
+from notabene.storage import JsonStorage, dumps_book, iter_records
+
+
+def write_abo(pathfile: Path, amount: int, is_trusted=True):
+    ab = {record[0]: [list(pair) for pair in record[1:]]
+          for record in fake_records(amount)}
+    with open(pathfile, "w") as fh:
+        if is_trusted:
+            fh.write(dumps_book(ab))
+        else:
+            fh.write(json.dumps(ab, indent=2, ensure_ascii=False))
+
+
+def bench(amount: int, is_trusted=True) -> dict:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        main.ADDRESSBOOK_PATHFILE = Path(tmpdir) / "bench.abo"
+        write_abo(main.ADDRESSBOOK_PATHFILE, amount, is_trusted)
+        start = perf_counter()
+        with open(main.ADDRESSBOOK_PATHFILE, "r") as fh:
+            for __ in iter_records(fh):
+                pass
+        parse = perf_counter() - start
+        start = perf_counter()
+        ab = main.load_addressbook(
+            JsonStorage(main.ADDRESSBOOK_PATHFILE))
+        startup = perf_counter() - start
+    return {"records": len(ab), "parse": parse, "startup": startup}
+
+
+if __name__ == "__main__":
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    for (title, is_trusted) in (("trusted", True), ("validated", False)):
+        result = bench(amount, is_trusted)
+        print(f"{title:>9}: {result['records']} records: "
+              f"parse {result['parse']:.2f} s, "
+              f"startup {result['startup']:.2f} s "
+              f"({result['startup'] / amount * 1e6:.1f} us/record)")
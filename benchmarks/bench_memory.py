@@ -0,0 +1,40 @@
+"""Memory used by address book per contact (tracemalloc)
+
+    $ python3 -m benchmarks.bench_memory [amount]
+"""
+
+import sys
+import tracemalloc
+
+from benchmarks.fakebook import fake_records
+from notabene.addressbook import AddressBook
+from notabene.record import Record
+
+
+def traced(build) -> int:
+    """Return bytes allocated by build() and still alive"""
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    result = build()
+    stop = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del result
+    return sum(stat.size_diff for stat in stop.compare_to(start, "filename"))
+
+
+def bench(amount: int) -> dict:
+    records = tuple(fake_records(amount))
+    return {
+        "fields": sum(len(record) - 1 for record in records) / amount,
+        "records": traced(lambda: [Record(record[1:])
+                                   for record in records]) / amount,
+        "book": traced(lambda: AddressBook(records)) / amount,
+    }
+
+
+if __name__ == "__main__":
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    result = bench(amount)
+    print(f"{amount} contacts, {result['fields']:.2f} fields per contact")
+    print(f"Records only:  {result['records']:6.0f} bytes per contact")
+    print(f"Address book:  {result['book']:6.0f} bytes per contact")
@@ -0,0 +1,51 @@
+"""Phone: validation and comparison by cached digits
+
+    $ python3 -m benchmarks.bench_phone [amount]
+"""
+
+import random
+import sys
+from time import perf_counter
+
+from benchmarks.fakebook import fake_phone
+from notabene.phone import Phone
+
+
+def timeit(func, args) -> float:
+    start = perf_counter()
+    for arg in args:
+        func(arg)
+    return perf_counter() - start
+
+
+def bench(amount: int) -> dict:
+    rnd = random.Random(1)
+    numbers = [Phone.normalize_phone(fake_phone(rnd)) for __ in range(amount)]
+    phones = [Phone(number) for number in numbers]
+    result = {}
+
+    result["create"] = timeit(Phone, numbers)
+
+    # Record.delete() compares each field with value
+    value = numbers[0]
+    start = perf_counter()
+    [phone for phone in phones
+     if Phone.get_digits_from_str(str(phone))
+     != Phone.get_digits_from_str(value)]
+    result["compare_extract"] = perf_counter() - start
+    start = perf_counter()
+    [phone for phone in phones if phone != value]
+    result["compare_text"] = perf_counter() - start
+    value = phones[0]
+    start = perf_counter()
+    [phone for phone in phones if phone != value]
+    result["compare_phone"] = perf_counter() - start
+    return result
+
+
+if __name__ == "__main__":
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    result = bench(amount)
+    print(f"{amount} phones:")
+    for (mode, seconds) in result.items():
+        print(f"  {mode:22} {seconds * 1e3:8.1f} ms")
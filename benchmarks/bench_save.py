@@ -0,0 +1,35 @@
+"""Save after one phone edit: journal append vs full snapshot
+
+    $ python3 -m benchmarks.bench_save [amount]
+"""
+
+from pathlib import Path
+import sys
+import tempfile
+from time import perf_counter
+
+from benchmarks.fakebook import fake_records
+from notabene.addressbook import AddressBook
+from notabene.storage import JsonStorage
+
+
+def bench(amount: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage = JsonStorage(Path(tmpdir) / "bench.abo")
+        ab = AddressBook(fake_records(amount))
+        start = perf_counter()
+        storage.compact(ab)
+        snapshot = perf_counter() - start
+        name = next(iter(ab.keys()))
+        start = perf_counter()
+        ab[name].change("Phone", "+38 (099) 730-99-90")
+        storage.save(ab)
+        journal = perf_counter() - start
+    return {"snapshot": snapshot, "journal": journal}
+
+
+if __name__ == "__main__":
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    result = bench(amount)
+    print(f"{amount} records: full snapshot {result['snapshot'] * 1e3:.1f} ms,"
+          f" journal append {result['journal'] * 1e3:.2f} ms")
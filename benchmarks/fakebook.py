@@ -0,0 +1,80 @@
+"""Seeded generator of synthetic address book records
+
+Names are built from syllables, so any amount of unique names
+can be produced without extra packages. If Faker is installed,
+faker_records() gives realistic Ukrainian names and addresses.
+"""
+
+from datetime import datetime
+import random
+
+SYLLABLES = ("ан", "бо", "ва", "гри", "да", "ле", "ми", "на", "ок", "па",
+             "ро", "са", "ти", "ус", "фе", "хо", "ци", "ча", "ша", "ю",
+             "ко", "ля", "зе", "ві", "ст", "ри", "мо", "ку", "ен", "ло")
+PHONE_FORMATS = ("{a}-{b}-{c}", "+38 0{d} {a}-{b}-{c}",
+                 "({d}) {a} {b} {c}", "0{d} {a} {b} {c}")
+
+
+def fake_word(rnd: random.Random) -> str:
+    return "".join(rnd.choice(SYLLABLES)
+                   for __ in range(rnd.randint(2, 4))).capitalize()
+
+
+def fake_name(rnd: random.Random) -> str:
+    return " ".join(fake_word(rnd) for __ in range(rnd.randint(2, 3)))
+
+
+def fake_phone(rnd: random.Random) -> str:
+    return rnd.choice(PHONE_FORMATS).format(
+        a=rnd.randint(100, 999), b=rnd.randint(10, 99),
+        c=rnd.randint(10, 99), d=rnd.randint(10, 99))
+
+
+def fake_names(amount: int, seed=1) -> list:
+    rnd = random.Random(seed)
+    names = {}
+    while len(names) < amount:
+        names[fake_name(rnd)] = None
+    return list(names)
+
+
+def fake_records(amount: int, seed=1):
+    """Yield ("Name", ("Phone", "..."), ...) like load_addressbook()"""
+    rnd = random.Random(seed)
+    for name in fake_names(amount, seed):
+        record = (name,)
+        for __ in range(rnd.randint(1, 3)):
+            record += (("Phone", fake_phone(rnd)),)
+        if rnd.randint(0, 1):
+            record += (("Birthday", datetime.fromordinal(
+                rnd.randint(719528, 732677)).strftime(r"%d.%m.%Y")),)
+        if rnd.randint(0, 2) > 1:
+            record += (("Address", f"вул. {fake_word(rnd)}, "
+                                   f"буд. {rnd.randint(1, 99)}"),)
+        yield record
+
+
+def faker_records(amount: int, seed=1):
+    """The same as fake_records() but names and addresses are made by
+    Faker("uk_UA") like main.abo_faker.py. Phones are still made by
+    fake_phone() because not all Faker numbers are valid Phone
+    """
+    from faker import Faker
+    fake = Faker("uk_UA")
+    fake.seed_instance(seed)
+    rnd = random.Random(seed)
+    names = {}
+    while len(names) < amount:
+        name = fake.name().replace("пан ", "").replace("пані ", "")
+        if len(name.split(" ")) <= 3:
+            names[name] = None
+    for name in names:
+        record = (name,)
+        for __ in range(rnd.randint(1, 3)):
+            record += (("Phone", fake_phone(rnd)),)
+        if rnd.randint(0, 1):
+            record += (("Birthday", datetime.fromordinal(
+                rnd.randint(719528, 732677)).strftime(r"%d.%m.%Y")),)
+        if rnd.randint(0, 2) > 1:
+            record += (("Address", fake.address().replace("\n", ", ")),)
+        yield record
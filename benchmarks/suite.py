@@ -0,0 +1,213 @@
+"""Benchmark suite: key functions on seeded books of some sizes
+
+    $ python3 -m benchmarks.suite run [size ...] [--output result.json]
+                                      [--repeat 3] [--seed 1] [--faker]
+    $ python3 -m benchmarks.suite compare base.json new.json
+                                      [--threshold 0.1]
+
+'run' times load_addressbook(), AddressBook(records), get_similar(),
+'show <phone>', iter_by_sample(), report(), report(name) (like
+the pager and the web interface do), JSON_helper() and
+dump_addressbook() for each size (1000, 10000 and 100000 records by
+default) and writes seconds to JSON (to standard output without
+--output). Each time is the best of --repeat runs; functions with
+a query are timed per query. Books are made by fakebook.faker_records()
+with --faker (Faker must be installed) or by fakebook.fake_records().
+
+'compare' prints the ratio of new to base time for each function and
+size and exits with status 1 if any of them is slower than base by
+more than threshold (0.1 is 10%).
+"""
+
+from datetime import datetime
+import json
+from pathlib import Path
+import platform
+import random
+import sys
+import tempfile
+from time import perf_counter
+
+from benchmarks.fakebook import fake_phone, fake_records, faker_records
+from notabene import main
+from notabene.addressbook import AddressBook
+from notabene.selection import Selection
+from notabene.storage import JsonStorage
+
+SIZES = (1_000, 10_000, 100_000)
+# Queries of get_similar() and 'show <phone>'
+QUERIES = 100
+# iter_by_sample() scans the whole book
+SCAN_QUERIES = 4
+# Times less than it (seconds) are not compared: they are noise
+MIN_TIME = 1e-6
+
+
+def best_of(repeat: int, func, *args) -> float:
+    """Minimal time of func(*args) in seconds"""
+    best = None
+    for __ in range(repeat):
+        start = perf_counter()
+        func(*args)
+        elapsed = perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def each(func, queries: list):
+    def run():
+        for query in queries:
+            result = func(query)
+            if not isinstance(result, (str, tuple, list)):
+                # Generators (reports, iter_by_sample) are consumed
+                for __ in result:
+                    pass
+    return run
+
+
+def make_box(ab: AddressBook, storage):
+    """Box like main.create_box() for the given book"""
+    def box(): pass
+    box.storage = storage
+    box.ab = ab
+    box.ab_fit = Selection(ab.keys())
+    box.ab_fit_to_fit = box.ab_fit
+    return box
+
+
+def bench(amount: int, repeat=3, seed=1, is_faker=False) -> dict:
+    make_records = faker_records if is_faker else fake_records
+    records = list(make_records(amount, seed))
+    rnd = random.Random(seed)
+    names = [record[0] for record in records]
+    # Prefixes of words: some names are found by each of them
+    samples = [rnd.choice(name.split(" "))[:4]
+               for name in rnd.sample(names, QUERIES)]
+    phones = [fake_phone(rnd)[-7:] for __ in range(QUERIES)]
+    scan_samples = [rnd.choice(names).split(" ")[-1][:5]
+                    for __ in range(SCAN_QUERIES // 2)] \
+        + [f"*{rnd.randint(10, 99)}-?{rnd.randint(0, 9)}*"
+           for __ in range(SCAN_QUERIES - SCAN_QUERIES // 2)]
+    result = {}
+
+    result["AddressBook.__init__"] = best_of(repeat, AddressBook, records)
+    ab = AddressBook(records)
+    del records
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pathfile = Path(tmpdir) / "bench.abo"
+
+        def dump():
+            # New storage has no snapshot: the whole book is written
+            box = make_box(ab, JsonStorage(pathfile))
+            box.ab.is_modified = True
+            main.dump_addressbook(box)
+
+        result["dump_addressbook"] = best_of(repeat, dump)
+        result["load_addressbook"] = best_of(
+            repeat, lambda: main.load_addressbook(JsonStorage(pathfile)))
+
+    result["get_similar"] = best_of(
+        repeat, each(ab.get_similar, samples)) / QUERIES
+    box = make_box(ab, None)
+    result["show phone"] = best_of(
+        repeat, each(lambda phone: main.cmd_show(phone, box), phones)) \
+        / QUERIES
+    result["iter_by_sample"] = best_of(
+        repeat, each(ab.iter_by_sample, scan_samples)) / SCAN_QUERIES
+    result["report"] = best_of(repeat, ab.report)
+    report_names = rnd.sample(names, QUERIES)
+    result["report name"] = best_of(
+        repeat, each(ab.report, report_names)) / QUERIES
+    result["JSON_helper"] = best_of(repeat, ab.JSON_helper)
+    return result
+
+
+def run(sizes: list, repeat=3, seed=1, is_faker=False) -> dict:
+    results = {}
+    for amount in sizes:
+        results[str(amount)] = bench(amount, repeat, seed, is_faker)
+        print(f"{amount} records: done", file=sys.stderr)
+    return {"meta": {"date": datetime.now().isoformat(timespec="seconds"),
+                     "python": platform.python_version(),
+                     "machine": platform.machine(),
+                     "generator": "faker" if is_faker else "fakebook",
+                     "seed": seed,
+                     "repeat": repeat},
+            "results": results}
+
+
+def compare(base: dict, new: dict, threshold=0.1) -> list:
+    """Return [(size, function, base time, new time, is_regression)]
+    for functions and sizes present in both runs
+    """
+    rows = []
+    for (size, times) in new["results"].items():
+        base_times = base["results"].get(size, {})
+        for (func, new_time) in times.items():
+            base_time = base_times.get(func)
+            if base_time is None:
+                continue
+            is_regression = new_time > MIN_TIME \
+                and new_time > base_time * (1 + threshold)
+            rows.append((size, func, base_time, new_time, is_regression))
+    return rows
+
+
+def option(args: list, name: str, default):
+    """Value after option name in args (both are removed from args)"""
+    if name not in args:
+        return default
+    i = args.index(name)
+    if i + 1 == len(args):
+        raise SystemExit(f"Value of option {name} is required")
+    value = args[i + 1]
+    del args[i:i + 2]
+    return type(default)(value)
+
+
+def main_run(args: list):
+    output = option(args, "--output", "")
+    repeat = option(args, "--repeat", 3)
+    seed = option(args, "--seed", 1)
+    is_faker = "--faker" in args
+    if is_faker:
+        args.remove("--faker")
+    sizes = [int(arg) for arg in args] or list(SIZES)
+    try:
+        text = json.dumps(run(sizes, repeat, seed, is_faker), indent=2)
+    except ImportError:
+        raise SystemExit("Faker is not installed, use: pip3 install faker")
+    if output == "":
+        print(text)
+    else:
+        with open(output, "w") as fh:
+            fh.write(text + "\n")
+
+
+def main_compare(args: list) -> int:
+    threshold = option(args, "--threshold", 0.1)
+    if len(args) != 2:
+        raise SystemExit(__doc__)
+    (base, new) = [json.loads(Path(arg).read_text()) for arg in args]
+    rows = compare(base, new, threshold)
+    for (size, func, base_time, new_time, is_regression) in rows:
+        ratio = new_time / max(base_time, MIN_TIME)
+        print(f"{size:>8} {func:<22} {base_time * 1e3:11.3f} ms "
+              f"{new_time * 1e3:11.3f} ms {ratio:6.2f}x"
+              + ("  REGRESSION" if is_regression else ""))
+    regressions = sum(row[-1] for row in rows)
+    print(f"{regressions} regression(s) of {len(rows)} time(s), "
+          f"threshold {threshold:.0%}")
+    return int(regressions > 0)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args[:1] == ["run"]:
+        main_run(args[1:])
+    elif args[:1] == ["compare"]:
+        sys.exit(main_compare(args[1:]))
+    else:
+        raise SystemExit(__doc__)
@@ -8,14 +8,23 @@ License: MIT
 
 
 from notabene.field import Field
+from notabene.translit import translit_key
 
 
 class Address(Field):
+    # Transliterated address is computed once for search
+    __slots__ = ("_key",)
+    title = "Address"
+    order = 50
 
     def __init__(self, address=""):
-        super().__init__(value=address, title="Address", order=50)
-        if address != "":
-            self.value = address # to validate non empty address
+        super().__init__(value=address)
+
+    @classmethod
+    def from_trusted(cls, value):
+        field = super().from_trusted(value)
+        field._key = translit_key(value)
+        return field
 
     @staticmethod
     def normalize_address(address: str) -> str:
@@ -31,6 +40,12 @@ class Address(Field):
     def value(self, address):
         address = self.normalize(address)
         self._value = address
+        self._key = translit_key(address)
+
+    @property
+    def key(self) -> str:
+        """Lowercase transliterated address (see translit_key())"""
+        return self._key
 
     def normalize(self, value):
         return self.normalize_address(value)
@@ -7,11 +7,23 @@ License: MIT
 """
 
 
-from collections import UserDict
+from array import array
+from collections import UserDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import lru_cache
+from itertools import islice
 import os
 import re
 
-from notabene.record import Record
+from notabene.address import Address
+from notabene.backend import MemoryBackend
+from notabene.birthday import (BirthdayException, bulk_days_to_day,
+                                days_left_table)
+from notabene.dedupe import find_duplicates
+from notabene.phone import Phone, PhoneException
+from notabene.record import Record, RecordException
+from notabene.translit import has_ukrainian, translit_key
 
 
 class AddressBookException(Exception):
@@ -31,7 +43,10 @@ class AddressBook(UserDict):
                         + r"(?:\s" + pattern_name + r")?"
                         + r")?", re.IGNORECASE) # up to 3 word name pattern
 
-    def __init__(self, records=()):
+    # Sample without these symbols is searched as plain text
+    pattern_regex_symbol = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+    def __init__(self, records=(), backend=None):
         """ Instead tuple() in records can be used list[] or vice versa:
         ab = AddressBook(
             ("Mykola", (("Phone", "111-22-33"), ("Phone", "111-44-55"), ...)))
@@ -40,9 +55,31 @@ class AddressBook(UserDict):
             ("Mykola": (("Phone", "111-22-33"), ("Phone", "111-44-55"), ...))),
             ("Oleksa": (("Phone", "333-22-33"), ("Phone", "333-44-55"), ...))),
         ))
+        Any other iterable of records (e.g. generator) is loaded by load().
+        Records and indexes are kept by backend (MemoryBackend if None).
         """
+        # Names changed since the last save in order of changes:
+        # name -> True if record with name was removed at least once
+        self.changes = {}
+        # name -> transliterated name or None (see translit_name())
+        self.translit_names = {}
+        # Days left to each day of year (see days_left_table()) for
+        # search in reports. It is computed once a day: reports of
+        # records are cached without days left (see Record.report())
+        self.days_left = None
+        self.days_left_day = None
         super().__init__({})
-        self[None] = records # call __setitem__()
+        if backend is None:
+            backend = MemoryBackend()
+        # Records are changed only through _attach()/_detach()/_clear()
+        self.backend = backend
+        self.backend.on_update = self._record_changed
+        self.data = backend.data
+        if isinstance(records, tuple) or isinstance(records, list):
+            if len(records) != 0: # empty value clears backend
+                self[None] = records # call __setitem__()
+        else:
+            self.load(records)
         self.is_modified = False
 
     @staticmethod
@@ -143,30 +180,24 @@ class AddressBook(UserDict):
         """
         if key is None:
             if len(value) == 0:
-                self.data.clear()
+                self._clear()
                 self.is_modified = True
                 return
             if isinstance(value, tuple) or isinstance(value, list):
                 if isinstance(value[0], str):
-                    self.data[value[0]] = Record(value[1:])         # (1)
+                    self._attach(value[0], Record(value[1:]))       # (1)
                     self.is_modified = True
                     return
-                for item in value:                                  # (2)
-                    if not isinstance(item[0], str):
-                        raise AddressBookException(
-                            f"absent required name as "
-                            f"the first item in {item}")
-                    self.data[item[0]] = Record(item[1:])
-                    self.is_modified = True
+                self.load(value)                                    # (2)
                 return
             raise AddressBookException(f"not supported value {value}")
         elif isinstance(key, str):
             key = self.normalize_name(key)
             self.verify_name(key)
             if isinstance(value, tuple) or isinstance(value, list): # (3)
-                self.data[key] = Record(value)
+                self._attach(key, Record(value))
             elif isinstance(value, Record):                         # (4)
-                self.data[key] = value
+                self._attach(key, value)
             elif isinstance(value, str):
                 # Change name (rename)                              # (5)
                 self.rename(key, value)
@@ -178,15 +209,157 @@ class AddressBook(UserDict):
         self.is_modified = True
         return
 
+    def load(self, records, trusted=False):
+        """Add records from any iterable of
+        ("Name", ("Phone", "111222333"), ...) in one pass.
+        Fields of trusted records are not validated.
+        """
+        for item in records:
+            if not isinstance(item[0], str):
+                raise AddressBookException(
+                    f"absent required name as "
+                    f"the first item in {item}")
+            self._attach(item[0], Record(item[1:], trusted))
+            self.is_modified = True
+
+    # Rows in one chunk of bulk_import() validation
+    import_chunk_size = 2000
+
+    @staticmethod
+    def validate_rows(rows: list) -> list:
+        """Validate chunk of (row number, ("Name", ("Phone", "..."), ...))
+        rows in worker process. Return list of (row number, normalized
+        row or None, error text or None)
+        """
+        result = []
+        for (row_no, item) in rows:
+            try:
+                name = AddressBook.normalize_name(item[0])
+                AddressBook.verify_name(name)
+                # Fields are validated by Phone.verify(), Birthday.verify()
+                record = Record(item[1:])
+            except (AddressBookException, RecordException,
+                    PhoneException, BirthdayException) as e:
+                result.append((row_no, None, str(e.args[0])))
+                continue
+            result.append((row_no, (name,) + record.as_tuple_of_tuples(),
+                           None))
+        return result
+
+    @classmethod
+    def iter_validated(cls, rows, workers=None, chunk_size=None):
+        """Validate rows by chunks in process pool. Only a few chunks
+        are in work at once, so memory is bounded for any amount of rows
+        """
+        if chunk_size is None:
+            chunk_size = cls.import_chunk_size
+        if workers is None:
+            workers = os.cpu_count() or 1
+        rows = iter(rows)
+        chunks = iter(lambda: list(islice(rows, chunk_size)), [])
+        first = next(chunks, [])
+        if len(first) < chunk_size or workers == 1:
+            # Small amount of rows is validated faster without pool
+            yield from cls.validate_rows(first)
+            for chunk in chunks:
+                yield from cls.validate_rows(chunk)
+            return
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque((pool.submit(cls.validate_rows, first),))
+            for chunk in chunks:
+                pending.append(pool.submit(cls.validate_rows, chunk))
+                if len(pending) > 2 * workers:
+                    yield from pending.popleft().result()
+            while len(pending) != 0:
+                yield from pending.popleft().result()
+
+    def bulk_import(self, rows, workers=None, chunk_size=None) -> tuple:
+        """Import rows (row number, ("Name", ("Phone", "..."), ...)), e.g.
+        from notabene.importer.iter_file(). Rows are validated in process
+        pool (workers processes, all cores if None) and merged into the
+        book in one pass: fields of existing name are added to its record.
+        Return ((Name1, Name2, ...), ((row number, error text), ...))
+        """
+        names = {}
+        errors = []
+        for (row_no, item, error) in self.iter_validated(rows, workers,
+                                                         chunk_size):
+            if error is not None:
+                errors.append((row_no, error))
+                continue
+            name = item[0]
+            record = self.data.get(name)
+            if record is None:
+                if self.is_any_equal_by_combination(name):
+                    errors.append((row_no, f"name '{name}' already exists"))
+                    continue
+                self._attach(name, Record(item[1:], trusted=True))
+            else:
+                # Merge new fields into existing record
+                known = record.as_tuple_of_tuples()
+                fields = tuple(pair for pair in item[1:] if pair not in known)
+                present = set(title for (title, __) in known)
+                unique = [title for (title, __) in fields if title in present
+                          and Record.known_field_titles[title].is_unique]
+                if len(unique) != 0:
+                    errors.append((row_no, f"field {unique[0]} already "
+                                           f"exist and must be unique"))
+                    continue
+                if len(fields) != 0:
+                    record.add(fields, trusted=True)
+            names[name] = None
+            self.is_modified = True
+        return (tuple(names), tuple(errors))
+
+    def validate(self):
+        """Rebuild all records with validation of fields"""
+        for (name, record) in tuple(self.data.items()):
+            self._attach(name, Record(record.as_tuple_of_tuples()))
+
+    def __delitem__(self, key):
+        self._detach(key)
+
+    def _attach(self, name: str, record: Record):
+        """Store record with name and add it to indexes"""
+        self.translit_names.pop(name, None)
+        self.translit_name(name)
+        if name in self.data:
+            # Replacing keeps position of name in the book
+            self.backend.replace(name, record)
+            self.changes.setdefault(name, False)
+        else:
+            self.backend.add(name, record)
+            # New name is the last one in the book
+            self.changes[name] = self.changes.pop(name, False)
+
+    def _detach(self, name: str) -> Record:
+        """Remove record with name from the book and indexes"""
+        record = self.backend.remove(name) # KeyError if absent
+        self.translit_names.pop(name, None)
+        self.changes.pop(name, None)
+        self.changes[name] = True
+        return record
+
+    def _clear(self):
+        for name in tuple(self.data.keys()):
+            self.changes.pop(name, None)
+            self.changes[name] = True
+        self.translit_names.clear()
+        self.backend.clear()
+
+    def _record_changed(self, name: str):
+        """Is called by backend after modification of record with name"""
+        self.changes.setdefault(name, False)
+
     def rename(self, key: str, name: str) -> str:
         name = self.normalize_name(name)
         if key == name:
             return key # nothing to do
+        self.verify_name(name)
         if not self.equal_by_combination(key, name) \
                 and self.is_any_equal_by_combination(name):
             raise AddressBookException(f"name {name} already exist")
-        self.data[name] = self.data[key]
-        self.data.pop(key, None) # without exception
+        self._attach(name, self._detach(key))
         return name
 
     def get_similar(self, name:str) -> tuple:
@@ -194,14 +367,110 @@ class AddressBook(UserDict):
            return (Name1, Name2, ...)
         """
         name = self.normalize_name(name)
-        return tuple(key for key in self.data.keys() if self.is_similar(key, name))
+        is_ukrainian = has_ukrainian(name)
+        translit = translit_key(name)
+
+        def is_similar(key: str) -> bool:
+            if self.is_similar(key, name):
+                return True
+            # Names in other script are compared by transliteration
+            key_translit = self.translit_name(key)
+            if is_ukrainian:
+                return key_translit is None \
+                    and self.is_similar(translit_key(key), translit)
+            return key_translit is not None \
+                and self.is_similar(key_translit, translit)
+
+        candidates = self.backend.similar_candidates(name)
+        if candidates is None:
+            # Too short name: full scan
+            return tuple(key for key in self.data.keys() if is_similar(key))
+        return self.backend.in_book_order(key for key in candidates
+                                          if is_similar(key))
+
+    def translit_name(self, name: str):
+        """Transliterated name (see translit_key()) or None if name has
+        not Ukrainian letters. It is computed once: on insert or load
+        and for records of SQLite database (they are not attached on
+        load) on the first use
+        """
+        if name not in self.translit_names:
+            self.translit_names[name] = translit_key(name) \
+                if has_ukrainian(name) else None
+        return self.translit_names[name]
+
+    def get_fuzzy(self, name: str) -> tuple:
+        """Return (Name1, Name2, ...) of records with words near to
+           words of name (typos are allowed, see FuzzyIndex) sorted by
+           distance and then in book order
+        """
+        name = self.normalize_name(name)
+        if name == "":
+            return ()
+        matches = self.backend.fuzzy_matches(name)
+        distances = {key: distance for (distance, key) in matches}
+        # sorted() is stable, so book order is kept for equal distances
+        return tuple(sorted(self.backend.in_book_order(distances.keys()),
+                            key=distances.__getitem__))
+
+    def find_duplicates(self) -> list:
+        """Return [(Name1, Name2, ...), ...]: groups of records which
+           are probably the same person (see dedupe.find_duplicates())
+        """
+        return find_duplicates(self)
+
+    def merge(self, names) -> str:
+        """Add fields of records with names to the record of the first
+           name and remove them. Equal fields and phones which are the
+           same number with or without codes are skipped. Unique field
+           (e.g. Birthday) with other value is the error and nothing is
+           changed. Return the first name
+        """
+        (name, *others) = names
+        try:
+            record = self.data[name]
+            other_records = [self.data[other] for other in others]
+        except KeyError as e:
+            raise AddressBookException(f"no such name '{e.args[0]}'")
+        fields = list(record.fields)
+        new_fields = []
+        for other_record in other_records:
+            for field in other_record.fields:
+                same_fields = [known for known in fields
+                               if known.title == field.title]
+                if any(known.is_similar(field) if isinstance(field, Phone)
+                       else known == field.value for known in same_fields):
+                    continue
+                if field.is_unique and len(same_fields) != 0:
+                    raise AddressBookException(
+                        f"field {field.title} '{field.value}' differs from "
+                        f"'{same_fields[0].value}' of '{name}'")
+                fields.append(field)
+                new_fields.append((field.title, field.value))
+        record.add(new_fields, trusted=True)
+        for other in others:
+            self._detach(other)
+        self.is_modified = True
+        return name
+
+    def get_similar_by_phone(self, phone) -> tuple:
+        """Return (Name1, Name2, ...) of records which have
+           any phone similar to phone (see Phone.is_similar)
+        """
+        return self.backend.in_book_order(self.backend.phone_candidates(phone))
 
     def is_any_equal_by_combination(self, name: str) -> bool:
         name = self.normalize_name(name)
-        for key in self.data.keys():
-            if self.equal_by_combination(key, name):
-                return True
-        return False
+        return self.backend.has_equal_by_combination(name)
+
+    def upcoming_birthdays(self, days: int, today=None) -> tuple:
+        """Return (Name1, Name2, ...) of records with birthday in the
+           next days (0 is today) sorted by date and name
+        """
+        if today is None:
+            today = date.today()
+        return tuple(name for (__, name)
+                     in self.backend.upcoming_birthdays(days, today))
 
     def __str__(self):
         return str(self[None])
@@ -216,13 +485,55 @@ class AddressBook(UserDict):
             indent = len(str(len(names) + index))
             name_format = f"#%-{indent}d Name: %s"
             indent += len("# ")
+            records = [self.data[name] for name in names]
             return (os.linesep * 2).join(
                 name_format % (index := index + 1, name)
-                + self.data[name].report(indent)
-                for name in names)
+                + record.report(indent, days_left)
+                for (name, record, days_left) in zip(
+                    names, records, self.bulk_days_to_birthday(records)))
         return ""
 
-    def _sample_to_regex(self, sample):
+    def days_left_to_birthday(self, record):
+        """Days left to birthday of record or None if it has no birthday.
+        They are looked up in table which is computed once a day
+        """
+        birthday = record.birthday
+        if birthday is None or birthday.day is None:
+            return None
+        return self.days_left_table()[birthday.day]
+
+    def days_left_table(self, today=None) -> list:
+        """Days left to each day of year (see days_left_table()). Table
+        of the current date is computed once a day
+        """
+        if today is None:
+            today = date.today()
+        if self.days_left_day != today:
+            self.days_left = days_left_table(today)
+            self.days_left_day = today
+        return self.days_left
+
+    def bulk_days_to_birthday(self, records, today=None) -> list:
+        """Return days left to birthday for each record (None if it has
+        no birthday). Days are computed together in one pass
+        """
+        if today is None:
+            today = date.today()
+        positions = []
+        days = array("H")
+        for (position, record) in enumerate(records):
+            birthday = record.birthday
+            if birthday is not None and birthday.day is not None:
+                positions.append(position)
+                days.append(birthday.day)
+        days_left = [None] * len(records)
+        for (position, left) in zip(positions, bulk_days_to_day(
+                days, today, self.days_left_table(today))):
+            days_left[position] = left
+        return days_left
+
+    @staticmethod
+    def _sample_to_regex(sample):
         """Converts:
         Matches any zero or more characters: '*' -> '.*'
         Matches any one character: '?' -> '.?'
@@ -239,6 +550,25 @@ class AddressBook(UserDict):
         sample = re.sub(r"(?<!\\)\|", r"\|", sample)
         return sample
 
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _compile_sample(sample: str, flags: int):
+        return re.compile(AddressBook._sample_to_regex(sample), flags)
+
+    @staticmethod
+    def sample_cache_info():
+        """Hits/misses of compiled samples cache"""
+        return AddressBook._compile_sample.cache_info()
+
+    def _sample_matcher(self, sample: str):
+        """Return function(text) which is true if text matches sample"""
+        if self.pattern_regex_symbol.search(sample) is None:
+            # Plain text: case insensitive substring test
+            sample = sample.casefold()
+            return lambda text: sample in text.casefold()
+        return self._compile_sample(sample,
+                                    re.IGNORECASE|re.MULTILINE).search
+
     def iter_by_sample(self, sample: str, names=None):
         if names is None:
             names = list(self.data.keys())
@@ -246,20 +576,53 @@ class AddressBook(UserDict):
             names = (names,)
         if isinstance(names, tuple) or isinstance(names, list):
             try:
-                rex = re.compile(self._sample_to_regex(sample),
-                                re.IGNORECASE|re.MULTILINE)
+                is_matched = self._sample_matcher(sample)
+                is_translit_matched = self._translit_sample_matcher(sample)
             except re.error:
                 raise AddressBookException("error sample in metasymbols")
             index = 1
             for name in names:
-                if rex.search(self.report((name,), index=index)):
+                if is_matched(self.search_document(name, index)) \
+                        or (is_translit_matched is not None
+                            and is_translit_matched(
+                                self.translit_document(name))):
                     yield name
                 index += 1
 
+    def _translit_sample_matcher(self, sample: str):
+        """Return function(transliterated text) which is true if it
+        matches Latin sample or None if sample has Ukrainian letters
+        """
+        if has_ukrainian(sample):
+            return None
+        if self.pattern_regex_symbol.search(sample) is None:
+            sample = translit_key(sample)
+            return lambda text: sample in text
+        return self._compile_sample(sample,
+                                    re.IGNORECASE|re.MULTILINE).search
+
+    def translit_document(self, name: str) -> str:
+        """Transliterated name and addresses of record (lines)"""
+        return os.linesep.join(
+            [self.translit_name(name) or name.lower()]
+            + [field.key for field in self.data[name].fields
+               if isinstance(field, Address)])
+
+    def search_document(self, name: str, index=1) -> str:
+        """The same text as self.report((name,), index=index) but
+        is built from the cached record report
+        """
+        record = self.data[name]
+        return f"#{index} Name: {name}" + record.report(
+            len(str(index)) + 2, self.days_left_to_birthday(record))
+
     def JSON_helper(self):
         ab = {}
-        for (name, record) in self.data.items():
-            rec_list = list(record.as_tuple_of_tuples())
-            rec_list.sort(reverse=True, key=lambda it: it[0])
-            ab[name] = rec_list
+        for name in self.data.keys():
+            ab[name] = self.JSON_record(name)
         return ab
+
+    def JSON_record(self, name: str) -> list:
+        rec_list = list(self.data[name].as_tuple_of_tuples())
+        rec_list.sort(reverse=True, key=lambda it: it[0])
+        return rec_list
@@ -0,0 +1,156 @@
+"""Classes Backend and MemoryBackend
+
+Author: Dmytro Tarasiuk
+URL: https://github.com/RoyBebru/addressbook
+Email: RoyBebru@gmail.com
+License: MIT
+"""
+
+
+from abc import ABC, abstractmethod
+from functools import partial
+
+from notabene.birthdayindex import BirthdayIndex
+from notabene.nameindex import NameIndex
+from notabene.phoneindex import PhoneIndex
+
+
+class Backend(ABC):
+    """Keeps records of AddressBook and lookup indexes over them.
+
+    data is a mapping name -> Record in book order. AddressBook changes
+    it only through add()/replace()/remove()/clear(). Modified record
+    calls update() itself, then backend calls on_update(name).
+    """
+
+    def __init__(self):
+        self.data = {}
+        # Callable(name) which is called after record modification
+        self.on_update = None
+
+    def bind(self, name: str, record):
+        record.on_change = partial(self.update, name, record)
+
+    def update(self, name: str, record):
+        """Is called by record with name after its modification"""
+        self.reindex(name, record)
+        if self.on_update is not None:
+            self.on_update(name)
+
+    @abstractmethod
+    def add(self, name: str, record):
+        """Add record with new name to the end of the book"""
+
+    @abstractmethod
+    def replace(self, name: str, record):
+        """Replace record keeping position of name in the book"""
+
+    @abstractmethod
+    def remove(self, name: str):
+        """Remove and return record, raise KeyError if it is absent"""
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+    @abstractmethod
+    def reindex(self, name: str, record):
+        """Refresh indexes of changed record"""
+
+    @abstractmethod
+    def similar_candidates(self, name: str):
+        """Set of names which can be similar to name or None if all"""
+
+    @abstractmethod
+    def fuzzy_matches(self, name: str) -> list:
+        """List of (distance, name) of names with typos of name words
+        (see FuzzyIndex.rank())
+        """
+
+    @abstractmethod
+    def phone_candidates(self, phone) -> set:
+        """Set of names having phone similar to phone"""
+
+    @abstractmethod
+    def has_equal_by_combination(self, name: str) -> bool:
+        pass
+
+    @abstractmethod
+    def in_book_order(self, names) -> tuple:
+        pass
+
+    @abstractmethod
+    def upcoming_birthdays(self, days: int, today) -> list:
+        """List of (days left, name) for birthdays in the next days
+        sorted by days left and name
+        """
+
+
+class MemoryBackend(Backend):
+    """All records and indexes are in memory"""
+
+    def __init__(self):
+        super().__init__()
+        self.name_index = NameIndex()
+        self.phone_index = PhoneIndex()
+        self.birthday_index = BirthdayIndex()
+        # Name -> sequence number to return found names in book order
+        self._seq = {}
+        self._next_seq = 0
+
+    def add(self, name: str, record):
+        self._seq[name] = self._next_seq
+        self._next_seq += 1
+        self.name_index.add(name)
+        self.data[name] = record
+        self.bind(name, record)
+        self.phone_index.add(name, record)
+        self.birthday_index.add(name, record)
+
+    def replace(self, name: str, record):
+        self.data[name].on_change = None
+        self.data[name] = record
+        self.bind(name, record)
+        self.reindex(name, record)
+
+    def remove(self, name: str):
+        record = self.data.pop(name) # KeyError if absent
+        self.phone_index.discard(name)
+        self.birthday_index.discard(name)
+        self.name_index.discard(name)
+        del self._seq[name]
+        record.on_change = None
+        return record
+
+    def clear(self):
+        for record in self.data.values():
+            record.on_change = None
+        self.data.clear()
+        self._seq.clear()
+        self.name_index.clear()
+        self.phone_index.clear()
+        self.birthday_index.clear()
+
+    def reindex(self, name: str, record):
+        self.phone_index.discard(name)
+        self.phone_index.add(name, record)
+        self.birthday_index.discard(name)
+        self.birthday_index.add(name, record)
+
+    def similar_candidates(self, name: str):
+        return self.name_index.candidates(name)
+
+    def fuzzy_matches(self, name: str) -> list:
+        return self.name_index.fuzzy_matches(name)
+
+    def phone_candidates(self, phone) -> set:
+        return self.phone_index.find(phone)
+
+    def has_equal_by_combination(self, name: str) -> bool:
+        return self.name_index.has_equal_by_combination(name)
+
+    def in_book_order(self, names) -> tuple:
+        return tuple(sorted(names, key=self._seq.__getitem__))
+
+    def upcoming_birthdays(self, days: int, today) -> list:
+        return self.birthday_index.upcoming(days, today)
@@ -7,12 +7,71 @@ License: MIT
 """
 
 
+from array import array
+from calendar import isleap
 from datetime import date, datetime
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 from notabene.field import Field
 
 
+# Day of year is counted in the leap year calendar: 1..366
+LEAP_YEAR = 2000
+LEAP_YEAR_START = date(LEAP_YEAR, 1, 1).toordinal()
+# Less days are looked up without numpy: making arrays costs more
+NUMPY_MIN_DAYS = 1000
+
+
+def day_of_year(month: int, day: int) -> int:
+    return date(LEAP_YEAR, month, day).toordinal() - LEAP_YEAR_START + 1
+
+
+def date_of_day(day: int, year: int) -> date:
+    """Date of day of year in year. 29 February of not leap year
+    is 28 February
+    """
+    bday = date.fromordinal(LEAP_YEAR_START + day - 1)
+    if bday.month == 2 and bday.day == 29 and not isleap(year):
+        return date(year, 2, 28)
+    return bday.replace(year=year)
+
+
+def days_to_day(day: int, today: date) -> int:
+    """Days from today to the nearest day of year"""
+    bday = date_of_day(day, today.year)
+    if bday < today:
+        # The birthday is already happened
+        bday = date_of_day(day, today.year + 1)
+    return bday.toordinal() - today.toordinal()
+
+
+def days_left_table(today: date) -> list:
+    """Days from today for each day of year: table[day], table[0]
+    is not used
+    """
+    return [0] + [days_to_day(day, today) for day in range(1, 367)]
+
+
+def bulk_days_to_day(days: array, today: date, table=None):
+    """Days from today for each day of year in packed array('H').
+    All of them are looked up in one table which is computed once
+    (table of days_left_table(today) can be given)
+    """
+    if len(days) == 0:
+        return []
+    if table is None:
+        table = days_left_table(today)
+    if numpy is not None and len(days) >= NUMPY_MIN_DAYS:
+        return numpy.array(table, dtype=numpy.int16)[
+            numpy.frombuffer(days, dtype=numpy.uint16)].tolist()
+    return [table[day] for day in days]
+
+
 class BirthdayException(Exception):
     def __init__(self, *args, **kwargs):
         # Call parent constructor
@@ -20,11 +79,32 @@ class BirthdayException(Exception):
 
 
 class Birthday(Field):
-    # Common pattern for each object
+    # Parsed day of year (see day_of_year()) or None for empty value
+    __slots__ = ("_day",)
+    title = "Birthday"
+    order = 80
+    is_unique = True
+
     def __init__(self, birthday=""):
-        super().__init__(value=birthday, title="Birthday", order=80, is_unique=True)
-        if birthday != "":
-            self.value = birthday # to validate non epmpty birthday
+        self._day = None
+        super().__init__(value=birthday)
+
+    @classmethod
+    def from_trusted(cls, value):
+        field = super().from_trusted(value)
+        field._day = cls.parse_day(value)
+        return field
+
+    @staticmethod
+    def parse_day(birthday: str):
+        """Day of year of birthday in format 'dd.mm.YYYY'"""
+        if birthday == "":
+            return None
+        return day_of_year(int(birthday[3:5]), int(birthday[:2]))
+
+    @property
+    def day(self):
+        return self._day
 
     @property
     def value(self):
@@ -36,6 +116,7 @@ class Birthday(Field):
         if len(birthday) > 10:
             raise BirthdayException(birthday)
         # old_birthday = self._value
+        self._day = self.parse_day(birthday)
         self._value = birthday
 
     def verify(self, birthday):
@@ -63,18 +144,22 @@ class Birthday(Field):
     def __ne__(self, birthday):
         return not self == birthday
 
-    def days_to_birthday(self):
-        now = date.today()
-        bday = datetime.strptime(self.value, r"%d.%m.%Y").date()
-        bday = bday.replace(year=now.year)
-        abs_days_now = now.toordinal()
-        if abs_days_now > bday.toordinal():
-            # The birthday is already happened
-            bday = bday.replace(year = now.year + 1)
-        return bday.toordinal() - abs_days_now
+    def days_to_birthday(self, today=None):
+        if today is None:
+            today = date.today()
+        if self._day is None:
+            raise BirthdayException("birthday is empty")
+        return days_to_day(self._day, today)
+
+    def report(self, days_left=None):
+        """days_left can be computed in bulk (see bulk_days_to_day())"""
+        if days_left is None:
+            days_left = self.days_to_birthday()
+        return str(days_left).join(self.report_parts())
 
-    def report(self):
-        return f"{self.value} (+{self.days_to_birthday()} days left)"
+    def report_parts(self) -> tuple:
+        """Report text before and after days left"""
+        return (f"{self.value} (+", " days left)")
 
     def normalize(self, value):
         return value
@@ -85,6 +170,9 @@ if __name__ == "__main__":
     p2 = Birthday("28.03.2012")
     print(p2, p2.title, p2.order)
     print(p2.days_to_birthday())
+    p3 = Birthday("29.02.2000")
+    print(p3, p3.days_to_birthday(date(2023, 2, 27)),
+          p3.days_to_birthday(date(2024, 2, 27)))
     if p1 != p2:
         print("NOT EQ")
     else:
@@ -0,0 +1,83 @@
+"""Class BirthdayIndex
+
+Author: Dmytro Tarasiuk
+URL: https://github.com/RoyBebru/addressbook
+Email: RoyBebru@gmail.com
+License: MIT
+"""
+
+
+from calendar import isleap
+from datetime import date, timedelta
+
+from notabene.birthday import day_of_year, days_to_day
+
+
+class BirthdayIndex:
+    """Names grouped by day of year of birthday (see day_of_year()).
+
+    Each day of year has its own set of names, so adding and removing
+    a name take constant time. The window of upcoming days is one or
+    two (if it crosses the new year) ranges of days of year.
+    29 February is celebrated on 28 February of not leap year.
+    """
+
+    def __init__(self):
+        # Day of year -> set of names (item 0 is not used)
+        self.days = [set() for __ in range(367)]
+        # name -> day of year
+        self.keys = {}
+
+    @staticmethod
+    def day_of(record):
+        """Day of year of record birthday or None"""
+        birthday = record.birthday
+        return None if birthday is None else birthday.day
+
+    @staticmethod
+    def day_ranges(today: date, days: int) -> tuple:
+        """Ranges (first, last) of days of year which contain all
+        birthdays in the window today..today+days
+        """
+        if days >= 365:
+            return ((1, 366),)
+        end = today + timedelta(days=days)
+        first = day_of_year(today.month, today.day)
+        last = day_of_year(end.month, end.day)
+        if end.month == 2 and end.day == 28 and not isleap(end.year):
+            last += 1 # 29 February
+        if end.year == today.year:
+            return ((first, last),)
+        return ((first, 366), (1, last))
+
+    def add(self, name: str, record):
+        day = self.day_of(record)
+        if day is None:
+            return
+        self.keys[name] = day
+        self.days[day].add(name)
+
+    def discard(self, name: str):
+        day = self.keys.pop(name, None)
+        if day is None:
+            return
+        self.days[day].discard(name)
+
+    def clear(self):
+        for names in self.days:
+            names.clear()
+        self.keys.clear()
+
+    def upcoming(self, days: int, today: date) -> list:
+        """Return list of (days left, name) sorted by days left and name
+        for birthdays in the next days (today is 0)
+        """
+        upcoming = []
+        for (first, last) in self.day_ranges(today, days):
+            for day in range(first, last + 1):
+                if len(self.days[day]) == 0:
+                    continue
+                days_left = days_to_day(day, today)
+                if days_left <= days:
+                    upcoming += ((days_left, name) for name in self.days[day])
+        return sorted(upcoming)
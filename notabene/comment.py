@@ -11,11 +11,12 @@ from notabene.field import Field
 
 
 class Comment(Field):
+    __slots__ = ()
+    title = "Comment"
+    order = 95
 
     def __init__(self, comment=""):
-        super().__init__(value=comment, title="Comment", order=95)
-        if comment != "":
-            self.value = comment # to validate non empty comment
+        super().__init__(value=comment)
 
     @property
     def value(self):
@@ -0,0 +1,134 @@
+"""Search of duplicate records in the whole address book
+
+Author: Dmytro Tarasiuk
+URL: https://github.com/RoyBebru/addressbook
+Email: RoyBebru@gmail.com
+License: MIT
+"""
+
+
+from notabene.fuzzyindex import FuzzyIndex
+from notabene.phone import Phone
+
+# The same number can be written with or without country and area
+# codes, so only the last digits are compared
+PHONE_SUFFIX_LEN = 7
+# Bigger blocks (e.g. common phone of office) are not compared pairwise
+MAX_BLOCK_SIZE = 50
+
+
+def name_tokens(ab, name: str) -> tuple:
+    """Lowercase Latin tokens of name (see AddressBook.translit_name())"""
+    return tuple((ab.translit_name(name) or name.lower()).split(' '))
+
+
+def phone_suffixes(record) -> set:
+    return set(field.digits[-PHONE_SUFFIX_LEN:] for field in record.fields
+               if isinstance(field, Phone) and len(field.digits) >= 5)
+
+
+def birthday_of(record):
+    birthday = record.birthday
+    if birthday is None or birthday.value == "":
+        return None
+    return birthday.value
+
+
+def blocking_keys(tokens: tuple, record) -> set:
+    """Keys of blocks: only records with a common key are compared"""
+    keys = set(("phone", suffix) for suffix in phone_suffixes(record))
+    keys.add(("name",) + tuple(sorted(set(tokens))))
+    birthday = birthday_of(record)
+    if birthday is not None:
+        keys.update(("birthday", birthday, token) for token in set(tokens))
+    return keys
+
+
+def is_typo(tokens1: tuple, tokens2: tuple) -> bool:
+    """Each word of shorter name is near to a word of other one"""
+    (fewer, more) = sorted((tokens1, tokens2), key=len)
+    return all(any(FuzzyIndex.distance(token, other, 1) <= 1
+                   for other in more)
+               for token in fewer)
+
+
+def is_same_name(ab, item1: tuple, item2: tuple) -> bool:
+    """Names have the same words, are similar or differ by typos (see
+    FuzzyIndex). Names in different scripts are compared by
+    transliteration
+    """
+    ((name1, tokens1, __), (name2, tokens2, __)) = (item1, item2)
+    if set(tokens1) == set(tokens2):
+        return True
+    if ab.is_similar(name1, name2) \
+            or ab.is_similar(" ".join(tokens1), " ".join(tokens2)):
+        return True
+    return is_typo(tuple(name1.lower().split(' ')),
+                   tuple(name2.lower().split(' '))) \
+        or is_typo(tokens1, tokens2)
+
+
+def is_duplicate(ab, item1: tuple, item2: tuple) -> bool:
+    """Items are (name, tokens, record). Records are duplicates when
+    names are the same (see is_same_name()) and it is confirmed by a
+    common phone or the same birthday. Different birthdays can not be
+    merged (Birthday is unique)
+    """
+    (record1, record2) = (item1[2], item2[2])
+    if not is_same_name(ab, item1, item2):
+        return False
+    (birthday1, birthday2) = (birthday_of(record1), birthday_of(record2))
+    if birthday1 is not None and birthday2 is not None:
+        return birthday1 == birthday2
+    return len(phone_suffixes(record1) & phone_suffixes(record2)) != 0
+
+
+def find_duplicates(ab) -> list:
+    """List of groups (tuples of names in book order) of duplicates.
+
+    Records are compared only inside blocks of records with a common
+    blocking key, so time is near-linear while blocks are small.
+    Groups are joined transitively by union-find.
+    """
+    items = {}
+    blocks = {}
+    for (name, record) in ab.data.items():
+        tokens = name_tokens(ab, name)
+        items[name] = (name, tokens, record)
+        for key in blocking_keys(tokens, record):
+            blocks.setdefault(key, []).append(name)
+
+    # name -> parent name (union-find)
+    parents = {}
+
+    def root(name: str) -> str:
+        parents.setdefault(name, name)
+        while parents[name] != name:
+            parents[name] = parents[parents[name]]
+            name = parents[name]
+        return name
+
+    for names in blocks.values():
+        if len(names) < 2 or len(names) > MAX_BLOCK_SIZE:
+            continue
+        for (i, name1) in enumerate(names):
+            for name2 in names[i + 1:]:
+                if root(name1) != root(name2) \
+                        and is_duplicate(ab, items[name1], items[name2]):
+                    parents[root(name2)] = root(name1)
+
+    groups = {}
+    for name in ab.data.keys():
+        if name in parents:
+            groups.setdefault(root(name), []).append(name)
+    return [tuple(group) for group in groups.values() if len(group) > 1]
+
+
+if __name__ == "__main__":
+    from notabene.addressbook import AddressBook
+    ab = AddressBook((("Мілена Щириця", ("Phone", "+38 050 123-45-67")),
+                      ("Shchyrytsia Milena", ("Phone", "050 123 45 67")),
+                      ("Людмила Цибуленко", ("Birthday", "08.07.1988")),
+                      ("Людмила Цибуленка", ("Birthday", "08.07.1988")),
+                      ("Христина Вакуленко", ("Phone", "729-72-47"))))
+    print(find_duplicates(ab))
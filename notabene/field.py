@@ -10,14 +10,26 @@ from abc import ABC, abstractmethod
 
 
 class Field(ABC):
-    def __init__(self, value="", title="", order=0, is_unique=False):
-        # Field title, such as "Phone", "E-mail", "Birthday", etc
-        self.title = title
-        # Field to sort
-        self.order = order
+    # Title, order and uniqueness are the same for all fields of one
+    # class, so they are class attributes and instance keeps only value
+    __slots__ = ("_value",)
+    # Field title, such as "Phone", "E-mail", "Birthday", etc
+    title = ""
+    # Field to sort
+    order = 0
+    # Record can contain only one such field
+    is_unique = False
+
+    def __init__(self, value=""):
         self._value = ""
-        self.value = value
-        self.is_unique = is_unique
+        self.value = value # normalized and verified by subclass
+
+    @classmethod
+    def from_trusted(cls, value):
+        """Create field from already normalized and verified value"""
+        field = cls.__new__(cls)
+        field._value = value
+        return field
 
     @property
     def value(self):
@@ -45,7 +57,14 @@ class Field(ABC):
 
 
 if __name__ == "__main__":
-    f1 = Field("data", "Comment", 90)
+    class Note(Field):
+        __slots__ = ()
+        title = "Note"
+        order = 90
+
+        def normalize(self, value):
+            return value
+
+    f1 = Note("data")
     f1.value = "Datum"
-    f1.order = 85
     print(f1, f1.title, f1.order)
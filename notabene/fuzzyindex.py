@@ -0,0 +1,148 @@
+"""Class FuzzyIndex
+
+Author: Dmytro Tarasiuk
+URL: https://github.com/RoyBebru/addressbook
+Email: RoyBebru@gmail.com
+License: MIT
+"""
+
+
+class FuzzyIndex:
+    """Deletion neighbourhood (symmetric delete) of name tokens.
+
+    Each token is indexed by itself and by all strings which are got
+    by deleting up to max_distance letters from it. Two words with
+    distance up to max_distance (insertions, deletions, substitutions
+    and transpositions of neighbour letters) have a common such string,
+    so typo candidates of a word are found by its own deletions without
+    scanning of tokens. Candidates are verified by distance().
+    """
+    max_distance = 1
+
+    def __init__(self):
+        # deletion -> token or set of tokens (most deletions are unique)
+        self.deletions = {}
+
+    @classmethod
+    def iter_deletions(cls, word: str):
+        """Word and strings without up to max_distance letters (some
+        strings can be repeated)
+        """
+        yield word
+        level = (word,)
+        for __ in range(min(cls.max_distance, len(word) - 1)):
+            level = set(text[:i] + text[i + 1:]
+                        for text in level for i in range(len(text)))
+            yield from level
+
+    @staticmethod
+    def distance(word1: str, word2: str, limit: int) -> int:
+        """Optimal string alignment distance or limit + 1 if it is
+        greater than limit
+        """
+        if abs(len(word1) - len(word2)) > limit:
+            return limit + 1
+        previous = None
+        row = list(range(len(word2) + 1))
+        for i in range(1, len(word1) + 1):
+            (before, previous) = (previous, row)
+            row = [i] + [0] * len(word2)
+            for j in range(1, len(word2) + 1):
+                cost = 0 if word1[i - 1] == word2[j - 1] else 1
+                row[j] = min(previous[j] + 1, row[j - 1] + 1,
+                             previous[j - 1] + cost)
+                if i > 1 and j > 1 and word1[i - 1] == word2[j - 2] \
+                        and word1[i - 2] == word2[j - 1]:
+                    row[j] = min(row[j], before[j - 2] + 1)
+            if min(row) > limit:
+                return limit + 1
+        return row[-1] if row[-1] <= limit else limit + 1
+
+    def add(self, token: str):
+        for deletion in set(self.iter_deletions(token)):
+            tokens = self.deletions.get(deletion)
+            if tokens is None:
+                self.deletions[deletion] = token
+            elif isinstance(tokens, str):
+                self.deletions[deletion] = {tokens, token}
+            else:
+                tokens.add(token)
+
+    def discard(self, token: str):
+        for deletion in set(self.iter_deletions(token)):
+            tokens = self.deletions.get(deletion)
+            if tokens == token:
+                del self.deletions[deletion]
+            elif isinstance(tokens, set):
+                tokens.discard(token)
+                if len(tokens) == 1:
+                    self.deletions[deletion] = tokens.pop()
+
+    def clear(self):
+        self.deletions.clear()
+
+    def candidates(self, word: str) -> set:
+        """Tokens having common deletion with lowercase word"""
+        found = set()
+        for deletion in set(self.iter_deletions(word)):
+            tokens = self.deletions.get(deletion)
+            if isinstance(tokens, str):
+                found.add(tokens)
+            elif tokens is not None:
+                found.update(tokens)
+        return found
+
+    @classmethod
+    def verified(cls, word: str, tokens) -> dict:
+        """token -> distance for tokens not farther than max_distance"""
+        found = {}
+        for token in tokens:
+            distance = cls.distance(word, token, cls.max_distance)
+            if distance <= cls.max_distance:
+                found[token] = distance
+        return found
+
+    @staticmethod
+    def update_nearest(matches: dict, found: dict):
+        """Add found {token: distance} to matches keeping the minimal
+        distance of each token
+        """
+        for (token, distance) in found.items():
+            if distance < matches.get(token, distance + 1):
+                matches[token] = distance
+
+    def lookup(self, word: str) -> dict:
+        """token -> distance for tokens near to lowercase word"""
+        return self.verified(word, self.candidates(word))
+
+    @staticmethod
+    def rank(word_matches: list, names_of) -> list:
+        """List of (distance, name) of names matching each word.
+
+        word_matches is list of {token: distance} for each word of
+        query, names_of(tokens) returns pairs (token, name). Distance of
+        name is the sum of distances of its nearest tokens to words.
+        """
+        total = None
+        for matches in word_matches:
+            best = {}
+            for (token, name) in names_of(matches.keys()):
+                distance = matches[token]
+                if distance < best.get(name, distance + 1):
+                    best[name] = distance
+            if total is None:
+                total = best
+            else:
+                total = {name: distance + best[name]
+                         for (name, distance) in total.items()
+                         if name in best}
+        return [(distance, name) for (name, distance)
+                in (total or {}).items()]
+
+
+if __name__ == "__main__":
+    index = FuzzyIndex()
+    for token in ("цибуленко", "вакуленко", "людмила"):
+        index.add(token)
+    print(index.lookup("цибуленка"), index.lookup("цибулнеко"),
+          index.lookup("людмилла"), index.lookup("вакуле"))
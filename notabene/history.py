@@ -0,0 +1,88 @@
+"""Class History
+
+Author: Dmytro Tarasiuk
+URL: https://github.com/RoyBebru/addressbook
+Email: RoyBebru@gmail.com
+License: MIT
+"""
+
+
+from collections import deque
+import threading
+
+
+class History:
+    """Ring buffer of the last commands for web interface.
+
+    Each line has a sequence number, so a reader asks only for lines
+    after the last one it has got. Readers in other threads wait for
+    changes with wait().
+    """
+
+    def __init__(self, lines=(), maxlen=1000):
+        # (sequence number, line), the oldest line is the first
+        self._lines = deque(maxlen=maxlen)
+        self._seq = 0
+        # Is incremented by each change to wake up waiting readers
+        self._version = 0
+        self._changed = threading.Condition()
+        for line in lines:
+            self.append(line)
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the last line"""
+        return self._seq
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def append(self, line: str):
+        with self._changed:
+            self._seq += 1
+            self._lines.append((self._seq, line))
+            self._version += 1
+            self._changed.notify_all()
+
+    def notify(self):
+        """Wake up readers without a new line (e.g. state is changed)"""
+        with self._changed:
+            self._version += 1
+            self._changed.notify_all()
+
+    def since(self, seq: int) -> list:
+        """List of (sequence number, line) after seq which are still
+        in the buffer
+        """
+        with self._changed:
+            if seq >= self._seq:
+                return []
+            # Lines are numbered one by one, so the start is computed
+            first = self._seq - len(self._lines) + 1
+            return list(self._lines)[max(seq + 1 - first, 0):]
+
+    def lines(self) -> list:
+        with self._changed:
+            return [line for (__, line) in self._lines]
+
+    def snapshot(self) -> tuple:
+        """(sequence number of the last line, lines): a reader gets
+        lines after it with since()
+        """
+        with self._changed:
+            return (self._seq, [line for (__, line) in self._lines])
+
+    def wait(self, version: int, timeout=None) -> int:
+        """Wait for change after version. Return the current version"""
+        with self._changed:
+            self._changed.wait_for(lambda: self._version != version,
+                                   timeout)
+            return self._version
+
+
+if __name__ == "__main__":
+    h = History(("show Ро", "all"), maxlen=3)
+    h.append("search #2")
+    h.append("birthdays")
+    print(h.lines(), h.seq, h.since(2), h.since(4))
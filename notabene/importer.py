@@ -0,0 +1,168 @@
+"""Reading of records from CSV and vCard files
+
+Author: Dmytro Tarasiuk
+URL: https://github.com/RoyBebru/addressbook
+Email: RoyBebru@gmail.com
+License: MIT
+"""
+
+
+import csv
+from pathlib import Path
+import re
+
+from notabene.record import Record
+
+
+class ImporterException(Exception):
+    def __init__(self, *args, **kwargs):
+        # Call parent constructor
+        super(Exception, self).__init__(*args, **kwargs)
+
+
+# ISO 8601 date of vCard BDAY: 1985-04-12, 19850412, 1985-04-12T10:00Z
+pattern_iso_date = re.compile(r"^(\d{4})-?(\d{2})-?(\d{2})(?:T.*)?$")
+
+
+def normalize_birthday(birthday: str) -> str:
+    """Convert ISO date to 'dd.mm.YYYY', other text is not changed"""
+    m = pattern_iso_date.match(birthday.strip())
+    if m is None:
+        return birthday
+    return f"{m.group(3)}.{m.group(2)}.{m.group(1)}"
+
+
+def csv_column_title(column: str):
+    """Field title of CSV column: 'Name', 'phone', 'Phone 2' -> 'Phone'
+    or None for unknown column
+    """
+    title = column.strip().rstrip("0123456789 ").capitalize()
+    if title == "Name" or title in Record.known_field_titles:
+        return title
+    return None
+
+
+def iter_csv(fh):
+    """Yield (line number, ("Name", ("Phone", "111-22-33"), ...)) for
+    each row of CSV file with header. Columns are Name and field titles
+    (title can be repeated or numbered: Phone, Phone2, ...)
+    """
+    reader = csv.reader(fh)
+    header = next(reader, None)
+    if header is None:
+        return
+    titles = [csv_column_title(column) for column in header]
+    if "Name" not in titles:
+        raise ImporterException("CSV header has no column 'Name'")
+    name_column = titles.index("Name")
+    for row in reader:
+        if len(row) == 0:
+            continue
+        name = row[name_column] if name_column < len(row) else ""
+        fields = tuple(
+            (title, normalize_birthday(value) if title == "Birthday"
+                    else value)
+            for (title, value) in zip(titles, row)
+            if title is not None and title != "Name" and value.strip() != "")
+        yield (reader.line_num, (name,) + fields)
+
+
+def unescape_vcard(text: str) -> str:
+    return re.sub(r"\\(.)", lambda m: "\n" if m.group(1) in "nN"
+                  else m.group(1), text)
+
+
+def split_vcard(text: str, separator=";") -> list:
+    """Split structured value by not escaped separator"""
+    return [unescape_vcard(part)
+            for part in re.split(r"(?<!\\)" + separator, text)]
+
+
+def iter_vcard_lines(fh):
+    """Yield (line number, unfolded content line) of vCard file"""
+    (line_no, line) = (0, None)
+    for (number, raw) in enumerate(fh, 1):
+        raw = raw.rstrip("\r\n")
+        if raw[:1] in (" ", "\t") and line is not None:
+            line += raw[1:] # folded line
+            continue
+        if line is not None:
+            yield (line_no, line)
+        (line_no, line) = (number, raw)
+    if line is not None:
+        yield (line_no, line)
+
+
+def vcard_record(properties: list) -> tuple:
+    """("Name", ("Phone", "111-22-33"), ...) from (NAME, value) of vCard"""
+    name = ""
+    fields = ()
+    for (prop, value) in properties:
+        if prop == "FN":
+            name = unescape_vcard(value)
+        elif prop == "N" and name == "":
+            # Family;Given;Additional;Prefix;Suffix
+            parts = split_vcard(value) + [""] * 3
+            name = " ".join(part for part in (parts[1], parts[2], parts[0])
+                            if part != "")
+        elif prop == "TEL":
+            if value.lower().startswith("tel:"):
+                value = value[len("tel:"):] # vCard 4 URI
+            fields += (("Phone", value),)
+        elif prop == "BDAY":
+            fields += (("Birthday", normalize_birthday(value)),)
+        elif prop == "ADR":
+            fields += (("Address", ", ".join(
+                part for part in split_vcard(value) if part != "")),)
+        elif prop == "NOTE":
+            fields += (("Comment", unescape_vcard(value)),)
+    return (name,) + fields
+
+
+def iter_vcard(fh):
+    """Yield (line number, ("Name", ("Phone", "111-22-33"), ...)) for
+    each vCard 3.0/4.0 of file. Line number is the line of BEGIN:VCARD
+    """
+    properties = None
+    start = 0
+    for (line_no, line) in iter_vcard_lines(fh):
+        (prop, __, value) = line.partition(":")
+        # Remove group (item1.TEL) and parameters (TEL;TYPE=cell)
+        prop = prop.split(";")[0].split(".")[-1].upper()
+        if prop == "BEGIN" and value.strip().upper() == "VCARD":
+            properties = []
+            start = line_no
+        elif prop == "END" and value.strip().upper() == "VCARD":
+            if properties is not None:
+                yield (start, vcard_record(properties))
+            properties = None
+        elif properties is not None:
+            properties.append((prop, value))
+
+
+def iter_file(pathfile: Path):
+    """Yield (line number, record) of CSV (.csv) or vCard (.vcf,
+    .vcard) file
+    """
+    pathfile = Path(pathfile)
+    suffix = pathfile.suffix.lower()
+    if suffix == ".csv":
+        with open(pathfile, "r", newline="", encoding="utf-8-sig") as fh:
+            yield from iter_csv(fh)
+    elif suffix in (".vcf", ".vcard"):
+        with open(pathfile, "r", encoding="utf-8-sig") as fh:
+            yield from iter_vcard(fh)
+    else:
+        raise ImporterException(f"unknown file type '{pathfile.suffix}', "
+                                f"use .csv or .vcf")
+
+
+if __name__ == "__main__":
+    import io
+    print(list(iter_csv(io.StringIO(
+        "Name,Phone,Phone 2,Birthday\n"
+        "Mykola Petrenko,111-22-33,,1985-04-12\n"))))
+    print(list(iter_vcard(io.StringIO(
+        "BEGIN:VCARD\nVERSION:4.0\nFN:Oleksa Dovbush\n"
+        "TEL;TYPE=cell:tel:+380-50-123-45-67\nADR:;;Main St. 1;Kyiv\n"
+        " ;;;Ukraine\nEND:VCARD\n"))))
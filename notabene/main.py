@@ -10,32 +10,50 @@ License: MIT
 
 
 import atexit
+import hashlib
 import json
 import html
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import mimetypes
 import os
 from pathlib import Path
 import re
 import readline
+import shutil
 import subprocess
 import sys
+import threading
+import time
 import types
 from typing import Any
-from urllib.parse import urlparse, parse_qs, unquote_plus
+from urllib.parse import urlparse, parse_qs
 import webbrowser
 
 
 from notabene.addressbook import AddressBook, AddressBookException
 from notabene.birthday import BirthdayException
+from notabene.history import History
+from notabene.importer import ImporterException, iter_file
 from notabene.phone import Phone, PhoneException
 from notabene.record import Record, RecordException
+from notabene.selection import Selection
+from notabene.sqlitestorage import SqliteStorage
+from notabene.storage import JsonStorage
 
 
 """CONSTANTS"""
 ADDRESSBOOK_PATHFILE = Path.home() / ".notabene.abo"
+ADDRESSBOOK_DB_PATHFILE = Path.home() / ".notabene.db"
 HISTFILE = Path.home() / ".notabene.history"
 
 HTTPD_PORT = 8888
+# Records in one page of web interface answer
+HTTPD_PAGE_SIZE = 50
+HTTPD_MAX_PAGE_SIZE = 1000
+# Seconds between keep alive comments of event stream
+HTTPD_EVENTS_KEEPALIVE = 15
+# Names of httpd_counter() items in counter events
+HTTPD_COUNTER_NAMES = ("total", "match_set", "match_subset", "modified")
 
 def command_error_catcher(cmd_hundler):
     def decor(cmd_args, box):
@@ -66,6 +84,8 @@ def cmd_help(*__):
         + "> show 111-22-33"
         + os.linesep + "Matches records with the relevant person name: "
         + "> show Кас'ян Дем'янович Непийпиво-В'юнець"
+        + os.linesep + "Matches names with typos, the nearest first: "
+        + "> show ~Цибуленка"
         + os.linesep + "Show matching records: > show"
         + os.linesep + "Search in matching records by template with "
         + "metasymbols '*'/'?': > search #2"
@@ -81,6 +101,14 @@ def cmd_help(*__):
         + "> add Голілиць Рада Варфоломіївна"
         + os.linesep + "Add new field to the last searched record: "
         + "> add phone +48 551-051-555"
+        + os.linesep + "Matches records with birthday in the next 7 days "
+        + "(0 is today): > birthdays 7"
+        + os.linesep + "Import records from CSV or vCard file and match "
+        + "them: > import contacts.vcf"
+        + os.linesep + "Match probable duplicates and list them by groups: "
+        + "> dedupe"
+        + os.linesep + "Merge records of group #2 (or all groups): "
+        + "> dedupe merge [2]"
     )
 
 
@@ -102,21 +130,69 @@ def cmd_add(cmd_args: str, box):
             args.pop(0) # omit option title "Name"
         # Create new record
         name = ' '.join(args)
+        AddressBook.verify_name(name)
         if box.ab.is_any_equal_by_combination(name):
             return f"Error: name '{' '.join(args)}' already exists"
         box.ab[name] = ()
-        box.ab_fit += (name,)
-        box.ab_fit_to_fit = (name,)
+        box.ab_fit.add(name)
+        box.ab_fit_to_fit = Selection((name,))
     box.ab.is_modified = True
     return None
 
 
 # @command_error_catcher
 def cmd_all(cmd_args: str, box):
-    box.ab_fit = tuple(box.ab.keys())
+    box.ab_fit = Selection(box.ab.keys())
     box.ab_fit_to_fit = box.ab_fit
     return None
 
+@command_error_catcher
+def cmd_birthdays(cmd_args: str, box):
+    if cmd_args == "":
+        days = 7
+    elif cmd_args.isdecimal():
+        days = int(cmd_args)
+    else:
+        return "Argument must be amount of days, use help for more information"
+    names = box.ab.upcoming_birthdays(days)
+    box.ab_fit = Selection(names)
+    box.ab_fit_to_fit = box.ab_fit
+    return report_names(box, names)
+
+
+@command_error_catcher
+def cmd_dedupe(cmd_args: str, box):
+    groups = box.ab.find_duplicates()
+    args = cmd_args.split(' ') # [''] == ''.split(' ')
+    if args[0] == "":
+        box.ab_fit = Selection(name for group in groups for name in group)
+        box.ab_fit_to_fit = box.ab_fit
+        if len(groups) == 0:
+            return "Duplicates are not found"
+        return os.linesep.join(
+            [f"Group #{group_no}: " + " | ".join(group)
+             for (group_no, group) in enumerate(groups, 1)]
+            + ["Merge group to its first record: > dedupe merge <group_no>"
+               ", all groups: > dedupe merge"])
+    if args[0].lower() not in ("merge", "злити"):
+        return "Argument must be 'merge', use help for more information"
+    if len(args) > 1:
+        if not args[1].isdecimal() or not 1 <= int(args[1]) <= len(groups):
+            return f"No such group: {args[1]}"
+        groups = [groups[int(args[1]) - 1]]
+    merged = []
+    errors = []
+    for group in groups:
+        try:
+            merged.append(box.ab.merge(group))
+        except AddressBookException as e:
+            errors.append(f"{' | '.join(group)}: {e.args[0]}")
+    box.ab_fit = Selection(merged)
+    box.ab_fit_to_fit = box.ab_fit
+    return os.linesep.join(
+        [f"Merged {len(merged)} group(s), {len(errors)} error(s)"] + errors)
+
+
 @command_error_catcher
 def cmd_change(cmd_args: str, box):
     args = cmd_args.split(' ') # [''] == ''.split(' ')
@@ -154,10 +230,10 @@ def cmd_change(cmd_args: str, box):
             key = box.ab_fit_to_fit[0]
             value = box.ab.rename(key, value)
             # Delete old name from MATCH list
-            box.ab_fit = tuple(filter(lambda e: e != key, box.ab_fit))
+            box.ab_fit.discard(key)
             # Add new name
-            box.ab_fit += (value,)
-            box.ab_fit_to_fit = (value,)
+            box.ab_fit.add(value)
+            box.ab_fit_to_fit = Selection((value,))
         else:
             return "Change error: name is required"
     box.ab.is_modified = True
@@ -199,16 +275,15 @@ def cmd_delete(cmd_args: str, box):
             # Delete all record(s) in ab_fit
             for name in box.ab_fit_to_fit:
                 box.ab.pop(name, None)
-            box.ab_fit = tuple(name for name in box.ab_fit
-                            if name not in box.ab_fit_to_fit)
+            box.ab_fit = box.ab_fit - box.ab_fit_to_fit
         else:
             value = " ".join(args)
             # Delete record(s) with Name similar to value
-            box.ab_fit = tuple(name for name in box.ab_fit
-                    if name not in box.ab_fit_to_fit or not AddressBook.is_similar(name, value))
-            for name in box.ab_fit_to_fit:
-                if AddressBook.is_similar(name, value):
-                    box.ab.pop(name)
+            removed = Selection(name for name in box.ab_fit_to_fit
+                                if AddressBook.is_similar(name, value))
+            for name in removed:
+                box.ab.pop(name)
+            box.ab_fit = box.ab_fit - removed
         box.ab_fit_to_fit = box.ab_fit
     box.ab.is_modified = True
     return
@@ -224,17 +299,20 @@ def cmd_exit(*args):
 
 
 def report_fit_to_fit(box):
+    """Yield pages of MATCH subset report. Records of the next page
+    are rendered only when it is requested
+    """
     report = ""
     report_lines = 0
     report_in_the_page_middle = False
+    # Amount of terminal lines can be changed between pages
+    terminal_lines = shutil.get_terminal_size().lines - 2
     for name in box.ab_fit_to_fit:
-        report_plus = box.ab.report(name, index=list(box.ab_fit).index(name)+1)
+        report_plus = box.ab.report(name, index=box.ab_fit.index(name)+1)
         report_plus_lines = report_plus.count(os.linesep) + 1
         # Empty line between records output
         report_plus_lines += int(report_in_the_page_middle)
 
-        # Amount of terminal lines can be changed between iterations
-        terminal_lines = os.get_terminal_size().lines - 2
         if not report_in_the_page_middle \
                 or report_lines + report_plus_lines <= terminal_lines:
             # Add empty line between records output
@@ -246,6 +324,7 @@ def report_fit_to_fit(box):
             continue
 
         yield report
+        terminal_lines = shutil.get_terminal_size().lines - 2
         report = report_plus
         report_lines = report_plus_lines - int(report_in_the_page_middle) * 2
         report_in_the_page_middle = True
@@ -256,10 +335,35 @@ def report_fit_to_fit(box):
     return
 
 
+def report_names(box, names):
+    """Yield report of names as one page. It is rendered only when it
+    is requested, e.g. web interface requests records page by page
+    """
+    report = box.ab.report(names)
+    if report != "":
+        yield report
+
+
+@command_error_catcher
+def cmd_import(cmd_args: str, box):
+    if cmd_args == "":
+        return "File name is required, use help for more information"
+    try:
+        (names, errors) = box.ab.bulk_import(
+            iter_file(Path(cmd_args).expanduser()))
+    except (OSError, ImporterException, UnicodeDecodeError) as e:
+        return f"Import Error: {e}"
+    box.ab_fit = Selection(names)
+    box.ab_fit_to_fit = box.ab_fit
+    return os.linesep.join(
+        [f"Imported {len(names)} record(s), {len(errors)} error(s)"]
+        + [f"Line {row_no}: {error}" for (row_no, error) in errors])
+
+
 @command_error_catcher
 def cmd_search(cmd_args: str, box):
-    box.ab_fit_to_fit = tuple(name for name in box.ab.iter_by_sample(
-            cmd_args, names=box.ab_fit))
+    box.ab_fit_to_fit = Selection(box.ab.iter_by_sample(
+            cmd_args, names=tuple(box.ab_fit)))
     return report_fit_to_fit(box)
 
 
@@ -267,19 +371,18 @@ def cmd_search(cmd_args: str, box):
 def cmd_show(cmd_args: str, box):
     if cmd_args == "":
         return report_fit_to_fit(box)
-    try:
-        box.ab_fit = ()
-        ph = Phone(cmd_args)
-        for name in box.ab.keys():
-            for field in box.ab[name].fields:
-                if isinstance(field, Phone) and field.is_similar(ph):
-                    box.ab_fit += (name,)
-                    break
-    except PhoneException:
-        # cmd_args is not Phone
-        box.ab_fit = box.ab.get_similar(cmd_args)
+    if cmd_args.startswith("~"):
+        # Names with typos sorted by distance
+        names = box.ab.get_fuzzy(cmd_args[1:])
+    else:
+        try:
+            names = box.ab.get_similar_by_phone(Phone(cmd_args))
+        except PhoneException:
+            # cmd_args is not Phone
+            names = box.ab.get_similar(cmd_args)
+    box.ab_fit = Selection(names)
     box.ab_fit_to_fit = box.ab_fit
-    return box.ab.report(box.ab_fit)
+    return report_names(box, names)
 
 
 def cmd_sort_files(*args):
@@ -310,9 +413,18 @@ HANDLERS = {
     cmd_all: re.compile(r"^(?:"+r"al|all|"
                         r"в|вс|вс[іе])$",
                         re.IGNORECASE),
+    cmd_birthdays: re.compile(r"^(?:bi|bir|birt|birth|birthd|birthda|"
+                              r"birthday|birthdays|"
+                              r"др|дн|дні|"
+                              r"нар|наро|народ|народж|народже|"
+                              r"народжен|народженн|народження)$",
+                              re.IGNORECASE),
     cmd_change: re.compile(r"^(?:c|ch|cha|chan|chang|change|"
                            r"зм|змі|змін|зміна|зміни|змінит|змінити)$",
                            re.IGNORECASE),
+    cmd_dedupe: re.compile(r"^(?:ded|dedu|dedup|dedupe|"
+                           r"дуб|дубл|дублі|дублік|дублікат|дублікати)$",
+                           re.IGNORECASE),
     cmd_delete: re.compile(r"^(?:d|de|del|dele|delet|delete|"
                            r"вид|вида|видал|видали|видалит|видалити)$",
                            re.IGNORECASE),
@@ -330,6 +442,10 @@ HANDLERS = {
     cmd_help: re.compile(r"^(?:\?|h|he|hel|help|"
                          r"доп|допо|допом|допомо|допомож|допоможи|допомог|допомога)$",
                          re.IGNORECASE),
+    cmd_import: re.compile(r"^(?:im|imp|impo|impor|import|"
+                           r"імп|імпо|імпор|імпорт|імпортуй|імпортуват|"
+                           r"імпортувати)$",
+                           re.IGNORECASE),
     cmd_search: re.compile(r"^(?:se|se[ea]|sear|searc|search|"
                            r"зн|зна|знай|знай[тд]|знай[тд]и|"
                            r"пош|пошу|пошук|"
@@ -353,28 +469,21 @@ def dump_addressbook(box):
     if not box.ab.is_modified:
         return
     try:
-        with open(ADDRESSBOOK_PATHFILE, "w") as fh:
-            fh.write(json.dumps(box.ab.JSON_helper(),
-                                indent=2,
-                                ensure_ascii=False))
+        box.storage.save(box.ab)
     except PermissionError:
         return
     box.ab.is_modified = False
     return
 
 
-def load_addressbook():
+def load_addressbook(storage) -> AddressBook:
+    ab = AddressBook(backend=storage.create_backend())
     try:
-        with open(ADDRESSBOOK_PATHFILE, "r") as fh:
-            ab = json.loads(fh.read())
+        storage.load(ab)
     except (FileNotFoundError, PermissionError):
-        return ()
-
-    ab_as_tuple = ()
-    for (name, record_list_of_list) in ab.items():
-        ab_as_tuple += ( ((name,) + tuple((pair[0], pair[1])
-                        for pair in record_list_of_list)), )
-    return ab_as_tuple
+        pass
+    ab.is_modified = False
+    return ab
 
 
 def input_or_default(prompt="", default=""):
@@ -384,88 +493,267 @@ def input_or_default(prompt="", default=""):
         return default
 
 
-def main_for_httpd(command, box):
-    print("nb_handler here!")
-    return "nb_handler here!"
+def httpd_counter(box) -> list:
+    return [len(box.ab), len(box.ab_fit), len(box.ab_fit_to_fit),
+            box.ab.is_modified]
+
+
+def httpd_page(box, offset: int, page_size: int) -> dict:
+    """Reports of page of MATCH subset records numbered as in MATCH set"""
+    names = box.ab_fit_to_fit[offset:offset + page_size]
+    return {"records": [{"index": box.ab_fit.index(name) + 1,
+                         "name": name,
+                         "report": box.ab.report(name,
+                                        index=box.ab_fit.index(name) + 1)}
+                        for name in names],
+            "total": len(box.ab_fit_to_fit),
+            "offset": offset}
+
+
+def main_for_httpd(request: dict, box) -> dict:
+    """Execute request of web interface:
+        {"command": "show Ро", "page_size": 20}
+    runs command like in terminal. If command output is a report of
+    records, the first page of MATCH subset is returned with cursor
+    for the next one:
+        {"cursor": "3:20", "page_size": 20}
+    Cursor is valid until the next command. Caller holds box lock.
+    """
+    try:
+        page_size = min(int(request.get("page_size", HTTPD_PAGE_SIZE)),
+                        HTTPD_MAX_PAGE_SIZE)
+    except (TypeError, ValueError):
+        page_size = HTTPD_PAGE_SIZE
+    page_size = max(page_size, 1)
+    answer = {"output": ""}
+    if "command" in request:
+        (cmd, cmd_args) = parse(normalize(str(request["command"])))
+        handler = get_handler(cmd)
+        if handler in (cmd_exit, cmd_sort_files):
+            answer["output"] = "Command is not available in web interface"
+            handler = None
+        result = handler(cmd_args, box) if handler is not None else None
+        box.generation += 1
+        # Event stream readers get new counters with the history line
+        readline.add_history(str(request["command"]))
+        box.history.append(str(request["command"]))
+        offset = None
+        if isinstance(result, types.GeneratorType):
+            # Report is not rendered: records are returned page by page
+            offset = 0
+        elif isinstance(result, str):
+            answer["output"] = result
+    elif "cursor" in request:
+        try:
+            (generation, offset) = map(int, str(request["cursor"])
+                                                .split(":"))
+        except ValueError:
+            generation = offset = -1
+        if generation != box.generation or offset < 0:
+            answer["output"] = "Cursor is expired: repeat command"
+            offset = None
+    else:
+        offset = None
+    if offset is not None:
+        answer.update(httpd_page(box, offset, page_size))
+        if offset + page_size < len(box.ab_fit_to_fit):
+            answer["cursor"] = f"{box.generation}:{offset + page_size}"
+    answer["counter"] = httpd_counter(box)
+    return answer
+
 
 class PageEngine(BaseHTTPRequestHandler):
+    # Keep connection alive between requests (responses have length)
+    protocol_version = "HTTP/1.1"
+    # Headers and body are sent separately: do not delay the body
+    disable_nagle_algorithm = True
     c_keep_running = True
     c_box = None
+    # Requests are handled in threads, but box is used under the lock
+    c_lock = threading.Lock()
+    # URL path -> (gzipped content, ETag, Content-Type) of web files
+    c_assets = {}
+
+    @classmethod
+    def load_assets(cls, webdir=Path(__file__).parent / "web"):
+        """Read all gzipped web files into memory once"""
+        assets = {}
+        for pathfile in webdir.glob("*.gz"):
+            content = pathfile.read_bytes()
+            path = "/" + pathfile.name[:-len(".gz")]
+            etag = '"' + hashlib.sha1(content).hexdigest() + '"'
+            content_type = mimetypes.guess_type(path)[0] \
+                or "application/octet-stream"
+            assets[path] = (content, etag, content_type)
+        cls.c_assets = assets
+
+    def is_not_modified(self, etag: str) -> bool:
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is None:
+            return False
+        return if_none_match.strip() == "*" or etag in (
+            tag.strip() for tag in if_none_match.split(","))
+
+    def send_body(self, body: bytes, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
-    def do_GET(self):
-        parsed = urlparse(self.path)
-
-        # Get the query string
-        # query_string = parsed.query
-
-        # Get the request path, this new path does not have the query string
-        path = parsed.path
+    def send_events(self):
+        """Server-Sent Events: counter changes and new history lines.
+        Each event is sent when it happens, so browser does not poll
+        """
+        history = PageEngine.c_box.history
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        # Browser reconnects with the last received history line, the
+        # first time page asks for lines after its history snapshot
+        since = parse_qs(urlparse(self.path).query).get("since", ())
+        try:
+            seq = int(self.headers.get("Last-Event-ID",
+                                       since[0] if since else history.seq))
+        except ValueError:
+            seq = history.seq
+        counter = [None] * len(HTTPD_COUNTER_NAMES)
+        version = history.version
+        try:
+            while PageEngine.c_keep_running:
+                events = ""
+                with PageEngine.c_lock:
+                    new_counter = httpd_counter(PageEngine.c_box)
+                delta = {name: value for (name, value, old_value)
+                         in zip(HTTPD_COUNTER_NAMES, new_counter, counter)
+                         if value != old_value}
+                counter = new_counter
+                if len(delta) != 0:
+                    events += f"event: counter\ndata: {json.dumps(delta)}\n\n"
+                for (seq, line) in history.since(seq):
+                    events += (f"id: {seq}\nevent: history\n"
+                               f"data: {json.dumps(line, ensure_ascii=False)}"
+                               f"\n\n")
+                if events != "":
+                    self.wfile.write(events.encode("utf-8"))
+                new_version = history.wait(version, HTTPD_EVENTS_KEEPALIVE)
+                if new_version == version:
+                    # Nothing happened: check that browser is alive
+                    self.wfile.write(b": keep alive\n\n")
+                version = new_version
+        except (BrokenPipeError, ConnectionResetError):
+            pass # browser has closed page
 
+    def do_GET(self):
+        path = urlparse(self.path).path
         if path == '/':
             path = "/index.html"
+        elif path == "/events":
+            self.send_events()
+            return
+
+        asset = self.c_assets.get(path)
+        if asset is None:
+            self.send_error(404)
+            return
+        (content, etag, content_type) = asset
+        if self.is_not_modified(etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
 
         self.send_response(200)
+        self.send_header("Content-Type", content_type)
         self.send_header("Content-Encoding", "gzip")
-        # self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("ETag", etag)
+        # Browser must ask whether cached file is still actual
+        self.send_header("Cache-Control", "no-cache")
         self.end_headers()
-
-        # Send the body of the response
-        name = str(Path(__file__).parent / "web" / (path[1:] + ".gz"))
-        try:
-            with open(name, "rb") as fh:
-                self.wfile.write(fh.read())
-        except (FileNotFoundError, KeyError) as e:
-            print(str(e))
+        self.wfile.write(content)
 
     def do_POST(self):
         # Read the content-length header
-        content_length = int(self.headers.get("Content-Length"))
+        content_length = int(self.headers.get("Content-Length", 0))
 
         # Read that many bytes from the body of the request
-        body = self.rfile.read(content_length)
+        body = self.rfile.read(content_length).decode("utf-8")
 
-        body = unquote_plus(body.decode("utf-8"))
-        print(f"Post BODY: '{body}'")
+        if self.headers.get_content_type() == "application/json":
+            try:
+                request = json.loads(body)
+            except json.JSONDecodeError:
+                request = None
+            if not isinstance(request, dict):
+                self.send_error(400, "JSON object is expected")
+                return
+        else:
+            # Form of web page: command=...
+            request = {key: values[0]
+                       for (key, values) in parse_qs(body).items()}
 
-        value = parse_qs(body)
-        if "exit" in value.keys():
+        if "exit" in request:
             print("Bye bye!")
             PageEngine.c_keep_running = False
-        elif "firstly" in value.keys():
-            bodict = {}
-            bodict["counter"] = [ len(PageEngine.c_box.ab)
-                                , len(PageEngine.c_box.ab_fit)
-                                , len(PageEngine.c_box.ab_fit_to_fit) ]
-            bodict["history"] = [ html.escape(readline.get_history_item(i))
-                                  for i in range(readline.get_current_history_length(), 0, -1)]
-            body = json.dumps(bodict);
-            print(body)
-
-        elif "command" in value.keys():
-            print(f"command='{value['command'][0]}'")
-            main_for_httpd(value["command"][0], PageEngine.c_box)
-
-        self.send_response(200)
-        self.end_headers()
+            answer = {}
+        elif "firstly" in request:
+            with PageEngine.c_lock:
+                answer = {"counter": httpd_counter(PageEngine.c_box)}
+            (seq, lines) = PageEngine.c_box.history.snapshot()
+            # The last command is the first
+            answer["history"] = [html.escape(line) for line
+                                 in reversed(lines)]
+            # Event stream sends lines after it
+            answer["history_seq"] = seq
+        else:
+            # Commands change box, so they are executed one by one
+            with PageEngine.c_lock:
+                answer = main_for_httpd(request, PageEngine.c_box)
 
         # Send the body in the response
-        self.wfile.write(bytes(body, "utf-8"))
+        self.send_body(json.dumps(answer, ensure_ascii=False).encode("utf-8"),
+                       "application/json")
+
+        if not PageEngine.c_keep_running:
+            # Event streams are finished
+            PageEngine.c_box.history.notify()
+            # Called in the request thread, so serve_forever() can stop
+            self.server.shutdown()
 
     def log_message(self, format: str, *args: Any) -> None:
         """Do not print log"""
         return
 
 
-def httpd_server(box):
+def create_httpd(box, port=HTTPD_PORT) -> ThreadingHTTPServer:
+    """Server which handles each connection in its own thread"""
     PageEngine.c_keep_running = True
-    box.is_vt = False
     PageEngine.c_box = box
-    try:
-        httpd = HTTPServer(('localhost', HTTPD_PORT), PageEngine)
+    # Number of commands executed by server: cursors of previous
+    # commands are expired
+    box.generation = 0
+    if not hasattr(box, "history"):
+        box.history = History()
+    if len(PageEngine.c_assets) == 0:
+        PageEngine.load_assets()
+    httpd = ThreadingHTTPServer(('localhost', port), PageEngine)
+    httpd.daemon_threads = True # do not wait kept alive connections
+    return httpd
+
 
-        webbrowser.open(f"http://localhost:{HTTPD_PORT}")
-        while PageEngine.c_keep_running:
-            httpd.handle_request()
+def httpd_server(box):
+    box.is_vt = False
+    try:
+        httpd = create_httpd(box)
+        try:
+            webbrowser.open(f"http://localhost:{HTTPD_PORT}")
+            httpd.serve_forever()
+        finally:
+            httpd.server_close()
     except (OSError, PermissionError, OverflowError, KeyboardInterrupt):
         pass
 
@@ -473,14 +761,97 @@ def httpd_server(box):
     return None
 
 
-def main() -> None:
+def create_box(is_sqlite: bool):
     # Function is used as convenient container for associated objects
-    turn_on_edit_in_input()
     def box(): pass
-    box.ab = AddressBook(load_addressbook())
-    box.ab_fit = tuple(box.ab.keys())
+    if is_sqlite:
+        box.storage = SqliteStorage(ADDRESSBOOK_DB_PATHFILE)
+        box.ab = load_addressbook(box.storage)
+        if not box.storage.is_json_imported():
+            # The first start with database: import JSON address book
+            # once, even if all records are deleted later
+            try:
+                JsonStorage(ADDRESSBOOK_PATHFILE).load(box.ab)
+            except (FileNotFoundError, PermissionError):
+                pass
+            box.storage.mark_json_imported()
+            box.ab.is_modified = len(box.ab) != 0
+    else:
+        box.storage = JsonStorage(ADDRESSBOOK_PATHFILE)
+        box.ab = load_addressbook(box.storage)
+    box.ab_fit = Selection(box.ab.keys())
     box.ab_fit_to_fit = box.ab_fit
+    return box
+
+
+def run_batch(box, lines) -> int:
+    """Execute commands without prompts and pagination. Address book
+    is saved once after all commands (or 'exit'). Return amount of
+    executed commands
+    """
+    box.is_vt = False
+    box.history = History()
+    executed = 0
+    for line in lines:
+        cmd_raw = normalize(line)
+        if cmd_raw == "" or cmd_raw.startswith("#"):
+            # Empty line or comment
+            continue
+        (cmd, cmd_args) = parse(cmd_raw)
+        handler = get_handler(cmd)
+        if handler is cmd_exit:
+            break
+        if cmd_raw == "@" or handler is cmd_sort_files:
+            print(f"Command is not available in batch mode: {cmd_raw}")
+            continue
+        result = handler(cmd_args, box)
+        executed += 1
+        if isinstance(result, types.GeneratorType):
+            # All pages without questions
+            for text in result:
+                print(text)
+        elif isinstance(result, str):
+            if result != "":
+                print(result)
+    dump_addressbook(box)
+    return executed
+
+
+def batch_lines(args: list):
+    """Lines of script after option --batch or of standard input"""
+    i = args.index("--batch") if "--batch" in args else len(args)
+    if i + 1 < len(args) and not args[i + 1].startswith("--"):
+        with open(args[i + 1], "r") as fh:
+            yield from fh
+    else:
+        yield from sys.stdin
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    if "--batch" in args or not sys.stdin.isatty():
+        box = create_box("--sqlite" in args)
+        start = time.perf_counter()
+        try:
+            executed = run_batch(box, batch_lines(args))
+        except FileNotFoundError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        except KeyboardInterrupt:
+            print("")
+            return # exit without saving
+        elapsed = time.perf_counter() - start
+        print(f"{executed} commands in {elapsed:.2f} s: "
+              f"{executed / max(elapsed, 1e-9):.0f} commands/sec",
+              file=sys.stderr)
+        return
+
+    turn_on_edit_in_input()
+    box = create_box("--sqlite" in args)
     box.is_vt = True
+    # The last commands for web interface
+    box.history = History(readline.get_history_item(i) for i
+                          in range(1, readline.get_current_history_length() + 1))
     print("Use ? for more information")
 
     while True:
@@ -520,6 +891,8 @@ def main() -> None:
 
         handler = get_handler(cmd)
         result = handler(cmd_args, box)
+        if handler not in (cmd_exit, cmd_sort_files):
+            box.history.append(cmd_raw)
 
         if isinstance(result, types.GeneratorType):
             # Iterator for pagenation
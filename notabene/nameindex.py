@@ -0,0 +1,211 @@
+"""Class NameIndex
+
+Author: Dmytro Tarasiuk
+URL: https://github.com/RoyBebru/addressbook
+Email: RoyBebru@gmail.com
+License: MIT
+"""
+
+
+from itertools import combinations
+
+from notabene.fuzzyindex import FuzzyIndex
+from notabene.translit import translit_key
+
+
+class NameIndex:
+    """Lowercase name tokens and token trigrams of address book names.
+
+    AddressBook.is_similar(key, name) is true only if either
+      (A) each word of name is a substring of some word of key, or
+      (B) each word of key is a substring of some word of name.
+    So candidates are:
+      (A) keys with all trigrams of the longest word of name;
+      (B) keys with all tokens among substrings of words of name.
+    Substrings and words longer than the longest token can't be
+    tokens or parts of tokens, so they are skipped.
+    Candidates must be verified by AddressBook.is_similar().
+
+    Also it keeps canonical keys of names for
+    AddressBook.equal_by_combination(): name length and sorted distinct
+    lowercase words. equal_by_combination(key, name) is true when the
+    lengths are equal and words of key are among words of name, so
+    it is enough to look up keys of word subsets of name (not longer
+    than max_words).
+
+    Tokens of transliterated name (see translit_key()) are indexed
+    together with tokens of name, so 'Shchyrytsia' and 'Щириця' find
+    each other through the same postings. Distinct tokens are also in
+    FuzzyIndex for search with typos.
+    """
+    gram_len = 3
+    # Words in name (see AddressBook.verify_name())
+    max_words = 3
+
+    def __init__(self):
+        # token -> set of names
+        self.tokens = {}
+        # trigram -> set of names
+        self.grams = {}
+        # token length -> amount of tokens with such length
+        self.token_lens = {}
+        # name -> tuple of tokens
+        self.keys = {}
+        # name -> tuple of tokens of transliterated name
+        self.translits = {}
+        # canonical key -> set of names
+        self.combinations = {}
+        # Deletion neighbourhood of tokens
+        self.fuzzy = FuzzyIndex()
+
+    @staticmethod
+    def combination_key(name: str, words=None) -> tuple:
+        if words is None:
+            words = set(name.lower().split(' '))
+        return (len(name),) + tuple(sorted(words))
+
+    @staticmethod
+    def split(name: str) -> tuple:
+        return tuple(name.lower().split(' '))
+
+    @staticmethod
+    def translit_split(name: str) -> tuple:
+        return tuple(translit_key(name).split(' '))
+
+    @classmethod
+    def all_tokens(cls, name: str) -> set:
+        """Tokens of name and of transliterated name"""
+        return set(cls.split(name) + cls.translit_split(name))
+
+    @classmethod
+    def iter_grams(cls, token: str):
+        for i in range(len(token) - cls.gram_len + 1):
+            yield token[i:i+cls.gram_len]
+
+    def add(self, name: str):
+        self.keys[name] = self.split(name)
+        self.translits[name] = self.translit_split(name)
+        for token in set(self.keys[name] + self.translits[name]):
+            if token not in self.tokens:
+                self.fuzzy.add(token)
+                self.token_lens[len(token)] = \
+                    self.token_lens.get(len(token), 0) + 1
+            self.tokens.setdefault(token, set()).add(name)
+            for gram in self.iter_grams(token):
+                self.grams.setdefault(gram, set()).add(name)
+        self.combinations.setdefault(
+            self.combination_key(name), set()).add(name)
+
+    def discard(self, name: str):
+        tokens = self.keys.pop(name, None)
+        if tokens is None:
+            return
+        for token in set(tokens + self.translits.pop(name)):
+            self._discard_from(self.tokens, token, name)
+            if token not in self.tokens:
+                self.fuzzy.discard(token)
+                self._discard_len(len(token))
+            for gram in self.iter_grams(token):
+                self._discard_from(self.grams, gram, name)
+        self._discard_from(self.combinations,
+                           self.combination_key(name), name)
+
+    @staticmethod
+    def _discard_from(postings: dict, key: str, name: str):
+        names = postings.get(key)
+        if names is None:
+            return
+        names.discard(name)
+        if len(names) == 0:
+            del postings[key]
+
+    def _discard_len(self, length: int):
+        if self.token_lens[length] == 1:
+            del self.token_lens[length]
+        else:
+            self.token_lens[length] -= 1
+
+    @property
+    def max_token_len(self) -> int:
+        return max(self.token_lens, default=0)
+
+    def clear(self):
+        self.tokens.clear()
+        self.grams.clear()
+        self.token_lens.clear()
+        self.keys.clear()
+        self.translits.clear()
+        self.combinations.clear()
+        self.fuzzy.clear()
+
+    @classmethod
+    def combination_keys(cls, name: str) -> list:
+        """Canonical keys of word subsets of normalized name. Subsets are
+        not longer than max_words: longer keys are not in the book
+        """
+        words = tuple(set(cls.split(name)))
+        return [cls.combination_key(name, subset)
+                for size in range(1, min(len(words), cls.max_words) + 1)
+                for subset in combinations(words, size)]
+
+    def has_equal_by_combination(self, name: str) -> bool:
+        """Is any key equal by combination with normalized name"""
+        return any(key in self.combinations
+                   for key in self.combination_keys(name))
+
+    def candidates(self, name: str):
+        """Return set of names which can be similar to normalized name
+        or its transliteration or None if name is too short to narrow
+        search
+        """
+        found = self._candidates(self.split(name), self.keys)
+        translit_found = self._candidates(self.translit_split(name),
+                                          self.translits)
+        if found is None or translit_found is None:
+            return None
+        return found | translit_found
+
+    def _candidates(self, words: tuple, keys: dict):
+        longest = max(words, key=len)
+        if len(longest) < self.gram_len:
+            return None
+        max_len = self.max_token_len
+
+        # (A) Names containing all trigrams of the longest word
+        found = set()
+        if len(longest) <= max_len:
+            postings = sorted((self.grams.get(gram, ())
+                               for gram in set(self.iter_grams(longest))),
+                              key=len)
+            found.update(set(postings[0]).intersection(*postings[1:]))
+
+        # (B) Names which tokens are substrings of the words
+        subs = self.substrings(words, max_len)
+        for sub in subs:
+            for key in self.tokens.get(sub, ()):
+                if key not in found \
+                        and all(token in subs for token in keys[key]):
+                    found.add(key)
+        return found
+
+    @staticmethod
+    def substrings(words: tuple, max_len: int) -> set:
+        """Substrings of words not longer than max_len"""
+        return set(word[i:j] for word in words
+                   for i in range(len(word) + 1)
+                   for j in range(i, min(i + max_len, len(word)) + 1))
+
+    def fuzzy_matches(self, name: str) -> list:
+        """List of (distance, name) of names with tokens near to each
+        word of normalized name (see FuzzyIndex.rank())
+        """
+        word_matches = []
+        for word in set(self.split(name)):
+            matches = {}
+            for variant in {word, translit_key(word)}:
+                FuzzyIndex.update_nearest(matches, self.fuzzy.lookup(variant))
+            word_matches.append(matches)
+        return FuzzyIndex.rank(
+            word_matches,
+            lambda tokens: ((token, key) for token in tokens
+                            for key in self.tokens[token]))
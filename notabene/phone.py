@@ -19,15 +19,25 @@ class PhoneException(Exception):
 
 
 class Phone(Field):
+    # Digits of number are the key of comparisons, they are kept to not
+    # extract them again for each comparison
+    __slots__ = ("_digits",)
+    title = "Phone"
+    order = 30
+
     # Common pattern for each object
     pattern_phone_number = re.compile(
             r"(?:\+\d{1,3})?\s*(?:\(\d{2,5}\)|\d{2,5})?"
             r"\s*\d{1,3}(?:\s*-)?\s*\d{1,3}(?:\s*-)?\s*\d{1,3}")
 
     def __init__(self, phone=""):
-        super().__init__(value=phone, title="Phone", order=30)
-        if phone != "":
-            self.value = phone # to validate non epmpty phone number
+        super().__init__(value=phone)
+
+    @classmethod
+    def from_trusted(cls, value):
+        field = super().from_trusted(value)
+        field._digits = cls.get_digits_from_str(value)
+        return field
 
     @staticmethod
     def normalize_phone(phone: str) -> str:
@@ -40,6 +50,13 @@ class Phone(Field):
     def get_digits_from_str(text: str) -> str:
         return "".join(filter(str.isdigit, text))
 
+    @staticmethod
+    def digits_key(phone) -> str:
+        """Digits of Phone (cached) or of text"""
+        if isinstance(phone, Phone):
+            return phone._digits
+        return Phone.get_digits_from_str(str(phone))
+
     @property
     def value(self):
         return self._value
@@ -50,6 +67,7 @@ class Phone(Field):
         self.verify(phone)
         # Phone number is proven and can be stored
         self._value = phone
+        self._digits = self.get_digits_from_str(phone)
 
     def verify(self, phone: str):
         """Check phone format"""
@@ -65,18 +83,19 @@ class Phone(Field):
         # Phone number is proven
         return
 
+    @property
+    def digits(self) -> str:
+        return self._digits
+
     def __eq__(self, phone):
-        if self.get_digits_from_str(str(self)) \
-                == self.get_digits_from_str(str(phone)):
-            return True
-        return False
+        return self._digits == self.digits_key(phone)
 
     def __ne__(self, phone):
         return not self == phone
 
     def is_similar(self, phone):
-        phone1 = self.get_digits_from_str(str(self))
-        phone2 = self.get_digits_from_str(str(phone))
+        phone1 = self._digits
+        phone2 = self.digits_key(phone)
         if phone1.find(phone2) != -1 or phone2.find(phone1) != -1:
             return True
         return False
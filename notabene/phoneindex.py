@@ -0,0 +1,97 @@
+"""Class PhoneIndex
+
+Author: Dmytro Tarasiuk
+URL: https://github.com/RoyBebru/addressbook
+Email: RoyBebru@gmail.com
+License: MIT
+"""
+
+
+from notabene.phone import Phone
+
+
+class PhoneIndex:
+    """Digit n-gram posting lists over all phone fields of address book.
+
+    Phone.is_similar() is true when digits of one number contain
+    digits of another one. So for the query digits:
+      - numbers containing query are found by intersection of
+        posting lists of all query n-grams;
+      - numbers contained in query are found by direct lookup of
+        every query substring (query is short).
+    """
+    gram_len = 3
+
+    def __init__(self):
+        # n-gram -> set of digit strings
+        self.grams = {}
+        # digit string -> set of names
+        self.numbers = {}
+        # name -> set of digit strings
+        self.keys = {}
+
+    @staticmethod
+    def digits_of(record) -> set:
+        return set(field.digits
+                   for field in record.fields if isinstance(field, Phone))
+
+    @classmethod
+    def iter_grams(cls, digits: str):
+        for i in range(len(digits) - cls.gram_len + 1):
+            yield digits[i:i+cls.gram_len]
+
+    def add(self, name: str, record):
+        keys = self.digits_of(record)
+        if len(keys) == 0:
+            return
+        self.keys[name] = keys
+        for number in keys:
+            names = self.numbers.get(number)
+            if names is None:
+                names = self.numbers[number] = set()
+                for gram in self.iter_grams(number):
+                    self.grams.setdefault(gram, set()).add(number)
+            names.add(name)
+
+    def discard(self, name: str):
+        for number in self.keys.pop(name, ()):
+            names = self.numbers[number]
+            names.discard(name)
+            if len(names) != 0:
+                continue
+            # Nobody has such number anymore
+            del self.numbers[number]
+            for gram in self.iter_grams(number):
+                numbers = self.grams.get(gram)
+                if numbers is None:
+                    continue
+                numbers.discard(number)
+                if len(numbers) == 0:
+                    del self.grams[gram]
+
+    def clear(self):
+        self.grams.clear()
+        self.numbers.clear()
+        self.keys.clear()
+
+    def find(self, phone) -> set:
+        """Return set of names having phone similar to phone"""
+        digits = Phone.digits_key(phone)
+        if len(digits) < self.gram_len:
+            numbers = set(self.numbers.keys())
+        else:
+            postings = sorted((self.grams.get(gram, ())
+                               for gram in set(self.iter_grams(digits))),
+                              key=len)
+            numbers = set(postings[0]).intersection(*postings[1:])
+        # Numbers containing digits
+        found = set(number for number in numbers if digits in number)
+        # Numbers contained in digits
+        found.update(digits[i:j]
+                     for i in range(len(digits) + 1)
+                     for j in range(i, len(digits) + 1)
+                     if digits[i:j] in self.numbers)
+        names = set()
+        for number in found:
+            names.update(self.numbers[number])
+        return names
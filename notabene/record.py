@@ -23,41 +23,90 @@ class RecordException(Exception):
 
 class Record:
     """Can contain any Field exclude Name"""
+    # Record has no __dict__: address book keeps many of them
+    __slots__ = ("_titles", "_fields", "on_change", "_reports")
     known_field_titles = {"Phone": Phone
                          , "Birthday": Birthday
                          , "Address": Address
                          , "Comment": Comment
                          }
-
-    def __init__(self, fields):
-        self.fields = ()
-        self.add(fields)
-
-    def sort_fields(self):
-        fields = list(self.fields)
-        fields.sort(key=lambda e: e.order)
-        return fields
-
-    def add(self, fields):
-        for record_pair in fields:
-            try:
+    # Titles in the order of fields output
+    titles_in_order = tuple(field_class.title for field_class in
+                            sorted(known_field_titles.values(),
+                                   key=lambda e: e.order))
+
+    def __init__(self, fields, trusted=False):
+        # Field title -> list of fields with such title in adding order.
+        # Title without fields is absent.
+        self._titles = {}
+        # All fields sorted by order or None: it is built from _titles
+        # on the first use after modification
+        self._fields = ()
+        # Callable without arguments which is called after each
+        # modification (it is set by AddressBook to keep indexes)
+        self.on_change = None
+        # Cached report parts: indent -> tuple (see report_parts()) or
+        # None. They don't depend on the current date and are dropped
+        # on each modification
+        self._reports = None
+        self.add(fields, trusted)
+
+    @property
+    def fields(self) -> tuple:
+        """All fields sorted by order"""
+        if self._fields is None:
+            self._fields = tuple(field for title in self.titles_in_order
+                                 for field in self._titles.get(title, ()))
+        return self._fields
+
+    def fields_of(self, title: str) -> tuple:
+        """Fields with title in adding order"""
+        return tuple(self._titles.get(title, ()))
+
+    @property
+    def birthday(self):
+        """Birthday field or None"""
+        fields = self._titles.get(Birthday.title)
+        return None if fields is None else fields[0]
+
+    def changed(self):
+        self._reports = None
+        if self.on_change is not None:
+            self.on_change()
+
+    def add(self, fields, trusted=False):
+        """Values of trusted fields are not validated (e.g. they are
+        loaded from file written by application)
+        """
+        try:
+            self._add(fields, trusted)
+        finally:
+            self.changed()
+
+    def _add(self, fields, trusted=False):
+        try:
+            for record_pair in fields:
+                try:
+                    field_class = Record.known_field_titles[record_pair[0]]
+                except KeyError:
+                    raise RecordException(f"no such field '{record_pair[0]}'")
                 # Create field
-                new_field = Record.known_field_titles[record_pair[0]](record_pair[1])
-            except KeyError:
-                raise RecordException(f"no such field '{record_pair[0]}'")
-            if new_field.is_unique:
-                is_present = False
-                for field in self.fields:
-                    if field.title == new_field.title:
-                        # Is already present such unique field: ignoring new_filed
-                        del new_field
-                        is_present = True
-                        break
-                if is_present: # is present field like new_field?
-                    raise RecordException(f"field {field.title} already "
+                if trusted:
+                    new_field = field_class.from_trusted(record_pair[1])
+                else:
+                    new_field = field_class(record_pair[1])
+                same_fields = self._titles.get(new_field.title)
+                if same_fields is None:
+                    self._titles[new_field.title] = [new_field]
+                elif new_field.is_unique:
+                    # Is already present such unique field: ignoring new_filed
+                    raise RecordException(f"field {new_field.title} already "
                                           f"exist and must be unique")
-            # Add new field to tuple
-            self.fields += (new_field,)
+                else:
+                    same_fields.append(new_field)
+        finally:
+            # Fields added before error are kept
+            self._fields = None
 
     def change(self, title: str, value: str, field_no=1):
         if isinstance(title, str):
@@ -66,14 +115,12 @@ class Record:
             if value == "":
                 # Title is present but value is absent
                 raise RecordException("to change a new parameter is required")
-            fields = list(self.fields)
-            fields.sort(key=lambda e: e.order)
-            for field in self.sort_fields():
-                if field.title == title:
-                    field_no -= 1
-                    if field_no <= 0:
-                        field.value = value # changing field
-                        break
+            fields = self._titles.get(title, ())
+            # field_no 0 and less is the same as 1
+            field_no = max(field_no, 1)
+            if field_no <= len(fields):
+                fields[field_no - 1].value = value # changing field
+                self.changed()
             return
 
     def delete(self, title="", value="", field_no=1):
@@ -81,39 +128,74 @@ class Record:
             if title == "":
                 # Field title is absent: remove all field with value,
                 # field_no is ignored
-                self.fields = tuple(field for field in self.fields
-                                    if field != value)
+                for title in tuple(self._titles.keys()):
+                    self._keep_fields(title,
+                        [field for field in self._titles[title]
+                         if field != value])
+                self.changed()
+                return
+            fields = self._titles.get(title)
+            if fields is None:
+                self.changed()
                 return
             if value == "":
                 # Title is present but value is absent: removing
                 # one field with field_no (if such is present)
-                fields = ()
-                for field in self.sort_fields():
-                    if field.title == title:
-                        field_no -= 1
-                        if field_no == 0:
-                            del field
-                            continue # forget field
-                    fields += (field,)
-                self.fields = fields
+                if 1 <= field_no <= len(fields):
+                    del fields[field_no - 1]
+                    self._keep_fields(title, fields)
+                self.changed()
                 return
             # Title and value is present: delete field with value.
             # field_no is ignored.
-            self.fields = tuple(field for field in self.fields
-                                if field.title != title or field != value)
+            self._keep_fields(title,
+                              [field for field in fields if field != value])
+            self.changed()
             return
 
+    def _keep_fields(self, title: str, fields: list):
+        if len(fields) == 0:
+            self._titles.pop(title, None)
+        else:
+            self._titles[title] = fields
+        self._fields = None
+
     def __str__(self):
         return str(self.as_tuple_of_tuples())
 
     def as_tuple_of_tuples(self):
         return tuple((field.title, str(field)) for field in self.fields)
 
-    def report(self, indent=0) -> str:
-        if len(self.fields) == 0:
-            return ""
-        field_format = " " * indent + "%s: %s"
-        return os.linesep + \
-            os.linesep.join(
-            field_format % (field.title, field.report())
-            for field in self.sort_fields())
+    def report(self, indent=0, days_left=None) -> str:
+        """days_left to birthday can be computed in bulk for many
+        records (see AddressBook.bulk_days_to_birthday())
+        """
+        parts = self.report_parts(indent)
+        if len(parts) == 1:
+            return parts[0]
+        if days_left is None:
+            days_left = self.birthday.days_to_birthday()
+        return parts[0] + str(days_left) + parts[1]
+
+    def report_parts(self, indent=0) -> tuple:
+        """Report text without days left to birthday: (text,) or
+        (text before days left, text after days left)
+        """
+        if self._reports is None:
+            self._reports = {}
+        parts = self._reports.get(indent)
+        if parts is not None:
+            return parts
+        parts = []
+        text = ""
+        field_format = os.linesep + " " * indent + "%s: %s"
+        for field in self.fields:
+            if isinstance(field, Birthday):
+                (before, after) = field.report_parts()
+                parts.append(text + field_format % (field.title, before))
+                text = after
+            else:
+                text += field_format % (field.title, field.report())
+        parts.append(text)
+        self._reports[indent] = parts = tuple(parts)
+        return parts
@@ -0,0 +1,96 @@
+"""Class Selection
+
+Author: Dmytro Tarasiuk
+URL: https://github.com/RoyBebru/addressbook
+Email: RoyBebru@gmail.com
+License: MIT
+"""
+
+
+class Selection:
+    """Ordered set of names of MATCH set or MATCH subset.
+
+    Membership, add() and discard() are O(1). Position of name (its
+    number in report) is found by a map name -> position which is
+    rebuilt once after removals, so numbering of many records is linear.
+    """
+
+    def __init__(self, names=()):
+        # Names in selection order (values are not used)
+        self._names = dict.fromkeys(names)
+        # name -> position from 0 or None if it must be rebuilt
+        self._positions = None
+        # Names as tuple for access by position or None
+        self._tuple = None
+
+    def __len__(self):
+        return len(self._names)
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def __getitem__(self, position: int) -> str:
+        if self._tuple is None:
+            self._tuple = tuple(self._names)
+        return self._tuple[position]
+
+    def __and__(self, names):
+        return self.intersection(names)
+
+    def __sub__(self, names):
+        return self.difference(names)
+
+    def __repr__(self):
+        return f"Selection({tuple(self._names)!r})"
+
+    def index(self, name: str) -> int:
+        """Position of name from 0, ValueError if it is absent"""
+        if self._positions is None:
+            self._positions = {name: position for (position, name)
+                               in enumerate(self._names)}
+        try:
+            return self._positions[name]
+        except KeyError:
+            raise ValueError(f"'{name}' is not in selection")
+
+    def add(self, name: str):
+        """Add name to the end if it is absent"""
+        if name in self._names:
+            return
+        self._names[name] = None
+        if self._positions is not None:
+            self._positions[name] = len(self._names) - 1
+        self._tuple = None
+
+    def discard(self, name: str):
+        if name in self._names:
+            del self._names[name]
+            self._positions = None
+            self._tuple = None
+
+    @staticmethod
+    def _as_container(names):
+        if isinstance(names, (Selection, set, frozenset, dict)):
+            return names
+        return set(names)
+
+    def intersection(self, names) -> "Selection":
+        """New selection of names which are also in names"""
+        names = self._as_container(names)
+        return Selection(name for name in self._names if name in names)
+
+    def difference(self, names) -> "Selection":
+        """New selection of names which are absent in names"""
+        names = self._as_container(names)
+        return Selection(name for name in self._names if name not in names)
+
+
+if __name__ == "__main__":
+    s = Selection(("Mykola", "Oleksa"))
+    s.add("Petro")
+    print(s, len(s), s.index("Petro"), s[0], "Oleksa" in s)
+    s.discard("Mykola")
+    print(s, s.index("Petro"), s & ("Petro",), s - ("Petro",))
@@ -0,0 +1,419 @@
+"""Classes SqliteBackend and SqliteStorage
+
+Author: Dmytro Tarasiuk
+URL: https://github.com/RoyBebru/addressbook
+Email: RoyBebru@gmail.com
+License: MIT
+"""
+
+
+from collections import OrderedDict
+from collections.abc import Mapping
+import json
+from pathlib import Path
+import sqlite3
+
+from notabene.backend import Backend
+from notabene.birthday import days_to_day
+from notabene.birthdayindex import BirthdayIndex
+from notabene.fuzzyindex import FuzzyIndex
+from notabene.nameindex import NameIndex
+from notabene.phone import Phone
+from notabene.phoneindex import PhoneIndex
+from notabene.record import Record
+from notabene.storage import Storage
+from notabene.translit import translit_key
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, -- book order
+    name TEXT NOT NULL UNIQUE,
+    combination TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS records_combination ON records (combination);
+CREATE TABLE IF NOT EXISTS fields (
+    record_id INTEGER NOT NULL, -- fields order is rowid order
+    title TEXT NOT NULL,
+    value TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS fields_record ON fields (record_id);
+CREATE TABLE IF NOT EXISTS name_tokens (
+    token TEXT NOT NULL,
+    record_id INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS name_tokens_token ON name_tokens (token);
+CREATE INDEX IF NOT EXISTS name_tokens_record ON name_tokens (record_id);
+CREATE INDEX IF NOT EXISTS name_tokens_length ON name_tokens (length(token));
+CREATE TABLE IF NOT EXISTS name_deletions (
+    deletion TEXT NOT NULL, -- see FuzzyIndex
+    token TEXT NOT NULL); -- distinct token of name_tokens
+CREATE INDEX IF NOT EXISTS name_deletions_deletion ON name_deletions (deletion);
+CREATE INDEX IF NOT EXISTS name_deletions_token ON name_deletions (token);
+CREATE TABLE IF NOT EXISTS name_grams (
+    gram TEXT NOT NULL,
+    record_id INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS name_grams_gram ON name_grams (gram);
+CREATE INDEX IF NOT EXISTS name_grams_record ON name_grams (record_id);
+CREATE TABLE IF NOT EXISTS phone_numbers (
+    number TEXT NOT NULL, -- digits only
+    record_id INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS phone_numbers_number ON phone_numbers (number);
+CREATE INDEX IF NOT EXISTS phone_numbers_record ON phone_numbers (record_id);
+CREATE TABLE IF NOT EXISTS phone_grams (
+    gram TEXT NOT NULL,
+    record_id INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS phone_grams_gram ON phone_grams (gram);
+CREATE INDEX IF NOT EXISTS phone_grams_record ON phone_grams (record_id);
+CREATE TABLE IF NOT EXISTS birthdays (
+    day INTEGER NOT NULL, -- day of year in leap year calendar
+    record_id INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS birthdays_day ON birthdays (day);
+CREATE INDEX IF NOT EXISTS birthdays_record ON birthdays (record_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL);
+"""
+
+# Tables with rows of one record except "records"
+RECORD_TABLES = ("fields", "name_tokens", "name_grams",
+                 "phone_numbers", "phone_grams", "birthdays")
+
+# Maximal amount of values in one "IN (...)"
+CHUNK_SIZE = 500
+
+
+def iter_chunks(values):
+    values = list(values)
+    for i in range(0, len(values), CHUNK_SIZE):
+        yield values[i:i+CHUNK_SIZE]
+
+
+def placeholders(values) -> str:
+    return ",".join("?" * len(values))
+
+
+def combination_text(key: tuple) -> str:
+    return json.dumps(key, ensure_ascii=False)
+
+
+class SqliteRecords(Mapping):
+    """Read only mapping name -> Record over database.
+
+    Recently used records are cached, so the same Record object is
+    returned while it is in use.
+    """
+    cache_size = 4096
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.db = backend.db
+        self.cache = OrderedDict()
+
+    def cache_put(self, name: str, record: Record):
+        self.cache[name] = record
+        self.cache.move_to_end(name)
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def __getitem__(self, name):
+        record = self.cache.get(name)
+        if record is not None:
+            self.cache.move_to_end(name)
+            return record
+        record_id = self.backend.record_id(name)
+        record = Record(self.db.execute(
+            "SELECT title, value FROM fields WHERE record_id = ? "
+            "ORDER BY rowid", (record_id,)).fetchall(), trusted=True)
+        self.backend.bind(name, record)
+        self.cache_put(name, record)
+        return record
+
+    def __contains__(self, name):
+        return name in self.cache or self.db.execute(
+            "SELECT 1 FROM records WHERE name = ?", (name,)).fetchone() \
+            is not None
+
+    def __iter__(self):
+        return iter([row[0] for row in self.db.execute(
+            "SELECT name FROM records ORDER BY id")])
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+
+class SqliteBackend(Backend):
+    """Records and indexes are in SQLite database tables.
+
+    The lookups repeat algorithms of NameIndex and PhoneIndex with
+    SQL queries, so only found records are read from database.
+    """
+
+    def __init__(self, db: sqlite3.Connection):
+        super().__init__()
+        self.db = db
+        self.data = SqliteRecords(self)
+
+    def record_id(self, name: str) -> int:
+        row = self.db.execute("SELECT id FROM records WHERE name = ?",
+                              (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return row[0]
+
+    def _write(self, record_id: int, record: Record):
+        """Insert fields, phone and birthday index rows of record"""
+        self.db.executemany(
+            "INSERT INTO fields (record_id, title, value) VALUES (?, ?, ?)",
+            ((record_id, field.title, str(field)) for field in record.fields))
+        numbers = PhoneIndex.digits_of(record)
+        self.db.executemany(
+            "INSERT INTO phone_numbers (number, record_id) VALUES (?, ?)",
+            ((number, record_id) for number in numbers))
+        self.db.executemany(
+            "INSERT INTO phone_grams (gram, record_id) VALUES (?, ?)",
+            ((gram, record_id) for gram in set(
+                gram for number in numbers
+                for gram in PhoneIndex.iter_grams(number))))
+        day = BirthdayIndex.day_of(record)
+        if day is not None:
+            self.db.execute(
+                "INSERT INTO birthdays (day, record_id) VALUES (?, ?)",
+                (day, record_id))
+
+    def _erase(self, record_id: int, tables=("fields", "phone_numbers",
+                                             "phone_grams", "birthdays")):
+        for table in tables:
+            self.db.execute(f"DELETE FROM {table} WHERE record_id = ?",
+                            (record_id,))
+
+    def add(self, name: str, record: Record):
+        record_id = self.db.execute(
+            "INSERT INTO records (name, combination) VALUES (?, ?)",
+            (name, combination_text(NameIndex.combination_key(name)))
+            ).lastrowid
+        tokens = NameIndex.all_tokens(name)
+        self._add_deletions(token for token in tokens
+                            if not self._has_token(token))
+        self.db.executemany(
+            "INSERT INTO name_tokens (token, record_id) VALUES (?, ?)",
+            ((token, record_id) for token in tokens))
+        self.db.executemany(
+            "INSERT INTO name_grams (gram, record_id) VALUES (?, ?)",
+            ((gram, record_id) for gram in set(
+                gram for token in tokens
+                for gram in NameIndex.iter_grams(token))))
+        self._write(record_id, record)
+        self.bind(name, record)
+        self.data.cache_put(name, record)
+
+    def _has_token(self, token: str) -> bool:
+        return self.db.execute(
+            "SELECT 1 FROM name_tokens WHERE token = ? LIMIT 1",
+            (token,)).fetchone() is not None
+
+    def _add_deletions(self, tokens):
+        """Index new distinct tokens in name_deletions"""
+        self.db.executemany(
+            "INSERT INTO name_deletions (deletion, token) VALUES (?, ?)",
+            ((deletion, token) for token in tokens
+             for deletion in set(FuzzyIndex.iter_deletions(token))))
+
+    def replace(self, name: str, record: Record):
+        old_record = self.data.cache.pop(name, None)
+        if old_record is not None:
+            old_record.on_change = None
+        self.reindex(name, record)
+        self.bind(name, record)
+        self.data.cache_put(name, record)
+
+    def remove(self, name: str) -> Record:
+        record = self.data[name] # KeyError if absent
+        record_id = self.record_id(name)
+        self._erase(record_id, RECORD_TABLES)
+        self.db.execute("DELETE FROM records WHERE id = ?", (record_id,))
+        self.db.executemany(
+            "DELETE FROM name_deletions WHERE token = ?",
+            ((token,) for token in NameIndex.all_tokens(name)
+             if not self._has_token(token)))
+        self.data.cache.pop(name, None)
+        record.on_change = None
+        return record
+
+    def clear(self):
+        for record in self.data.cache.values():
+            record.on_change = None
+        self.data.cache.clear()
+        for table in RECORD_TABLES + ("records", "name_deletions"):
+            self.db.execute(f"DELETE FROM {table}")
+
+    def reindex(self, name: str, record: Record):
+        record_id = self.record_id(name)
+        self._erase(record_id)
+        self._write(record_id, record)
+
+    def _max_token_len(self) -> int:
+        return self.db.execute(
+            "SELECT MAX(length(token)) FROM name_tokens").fetchone()[0] or 0
+
+    @staticmethod
+    def _grams_query(table: str, grams) -> tuple:
+        """Subquery of ids of records having all grams and its parameters.
+        Records having a subset of grams are a superset of them and
+        callers verify found records, so only CHUNK_SIZE grams are used
+        """
+        grams = tuple(grams)[:CHUNK_SIZE]
+        return (f"SELECT record_id FROM {table} "
+                f"WHERE gram IN ({placeholders(grams)}) "
+                f"GROUP BY record_id HAVING COUNT(*) = ?",
+                grams + (len(grams),))
+
+    def _names_by_grams(self, table: str, grams: set) -> list:
+        """Names of records having all grams"""
+        (query, params) = self._grams_query(table, grams)
+        return [row[0] for row in self.db.execute(
+            f"SELECT name FROM records WHERE id IN ({query})", params)]
+
+    def similar_candidates(self, name: str):
+        found = self._similar_candidates(NameIndex.split(name))
+        translit_found = self._similar_candidates(
+            NameIndex.translit_split(name))
+        if found is None or translit_found is None:
+            return None
+        return found | translit_found
+
+    def _similar_candidates(self, words: tuple):
+        longest = max(words, key=len)
+        if len(longest) < NameIndex.gram_len:
+            return None
+        max_len = self._max_token_len()
+        # (A) Names containing all trigrams of the longest word
+        found = set()
+        if len(longest) <= max_len:
+            found.update(self._names_by_grams(
+                "name_grams", set(NameIndex.iter_grams(longest))))
+        # (B) Names with tokens which are substrings of the words
+        subs = NameIndex.substrings(words, max_len)
+        for chunk in iter_chunks(subs):
+            found.update(row[0] for row in self.db.execute(
+                f"SELECT name FROM records WHERE id IN (SELECT record_id "
+                f"FROM name_tokens WHERE token IN ({placeholders(chunk)}))",
+                chunk))
+        return found
+
+    def fuzzy_matches(self, name: str) -> list:
+        word_matches = []
+        for word in set(NameIndex.split(name)):
+            deletions = tuple(set(
+                deletion for variant in {word, translit_key(word)}
+                for deletion in FuzzyIndex.iter_deletions(variant)))
+            tokens = set()
+            for chunk in iter_chunks(deletions):
+                tokens.update(row[0] for row in self.db.execute(
+                    f"SELECT DISTINCT token FROM name_deletions "
+                    f"WHERE deletion IN ({placeholders(chunk)})", chunk))
+            matches = {}
+            for variant in {word, translit_key(word)}:
+                FuzzyIndex.update_nearest(
+                    matches, FuzzyIndex.verified(variant, tokens))
+            word_matches.append(matches)
+        return FuzzyIndex.rank(word_matches, self._names_of_tokens)
+
+    def _names_of_tokens(self, tokens) -> list:
+        """(token, name) of records with tokens"""
+        pairs = []
+        for chunk in iter_chunks(tuple(tokens)):
+            pairs += self.db.execute(
+                f"SELECT t.token, r.name FROM name_tokens t "
+                f"JOIN records r ON r.id = t.record_id "
+                f"WHERE t.token IN ({placeholders(chunk)})", chunk).fetchall()
+        return pairs
+
+    def phone_candidates(self, phone) -> set:
+        digits = Phone.digits_key(phone)
+        query = ("SELECT DISTINCT r.name FROM phone_numbers p "
+                 "JOIN records r ON r.id = p.record_id WHERE ")
+        # Numbers containing digits
+        grams = set(PhoneIndex.iter_grams(digits))
+        if len(grams) == 0:
+            found = set(row[0] for row in self.db.execute(
+                query + "instr(p.number, ?) > 0", (digits,)))
+        else:
+            (grams_query, params) = self._grams_query("phone_grams", grams)
+            found = set(row[0] for row in self.db.execute(
+                query + f"instr(p.number, ?) > 0 AND p.record_id IN "
+                f"({grams_query})", (digits,) + params))
+        # Numbers contained in digits
+        subs = set(digits[i:j] for i in range(len(digits) + 1)
+                   for j in range(i, len(digits) + 1))
+        for chunk in iter_chunks(subs):
+            found.update(row[0] for row in self.db.execute(
+                query + f"p.number IN ({placeholders(chunk)})", chunk))
+        return found
+
+    def has_equal_by_combination(self, name: str) -> bool:
+        keys = [combination_text(key)
+                for key in NameIndex.combination_keys(name)]
+        for chunk in iter_chunks(keys):
+            if self.db.execute(
+                    f"SELECT 1 FROM records WHERE combination IN "
+                    f"({placeholders(chunk)}) LIMIT 1", chunk).fetchone():
+                return True
+        return False
+
+    def in_book_order(self, names) -> tuple:
+        rows = []
+        for chunk in iter_chunks(names):
+            rows += self.db.execute(
+                f"SELECT id, name FROM records WHERE name IN "
+                f"({placeholders(chunk)})", chunk).fetchall()
+        rows.sort()
+        return tuple(row[1] for row in rows)
+
+    def upcoming_birthdays(self, days: int, today) -> list:
+        upcoming = []
+        for (first, last) in BirthdayIndex.day_ranges(today, days):
+            for (day, name) in self.db.execute(
+                    "SELECT b.day, r.name FROM birthdays b "
+                    "JOIN records r ON r.id = b.record_id "
+                    "WHERE b.day BETWEEN ? AND ?", (first, last)):
+                days_left = days_to_day(day, today)
+                if days_left <= days:
+                    upcoming.append((days_left, name))
+        return sorted(upcoming)
+
+
+class SqliteStorage(Storage):
+    """Address book in SQLite database file.
+
+    Changes are written to database at once inside transaction which
+    is committed by save(), so exit without saving discards them.
+    """
+
+    def __init__(self, pathfile: Path):
+        # Web interface uses connection in request threads one by one
+        # (under PageEngine.c_lock)
+        self.db = sqlite3.connect(str(pathfile), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.executescript(SCHEMA)
+        self.db.commit()
+
+    def create_backend(self):
+        return SqliteBackend(self.db)
+
+    def load(self, ab):
+        # Records are read from database when they are needed
+        ab.changes.clear()
+        ab.is_modified = False
+
+    def save(self, ab):
+        self.db.commit()
+        ab.changes.clear()
+
+    def is_json_imported(self) -> bool:
+        """Was JSON address book imported on the first start"""
+        return self.db.execute(
+            "SELECT 1 FROM meta WHERE key = 'json_imported'").fetchone() \
+            is not None
+
+    def mark_json_imported(self):
+        """Mark is saved together with imported records by save()"""
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) "
+                        "VALUES ('json_imported', '1')")
@@ -0,0 +1,335 @@
+"""Address book file reading and writing
+
+Author: Dmytro Tarasiuk
+URL: https://github.com/RoyBebru/addressbook
+Email: RoyBebru@gmail.com
+License: MIT
+"""
+
+
+from abc import ABC, abstractmethod
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from notabene.backend import MemoryBackend
+
+
+# Version 1 is plain {"Name": [["Phone", "111-22-33"], ...], ...}
+# Version 2 is {"format": 2, "checksum": "...", "book": <version 1>}
+FORMAT_VERSION = 2
+
+
+class JsonReader:
+    """Incremental reader of JSON text from file.
+
+    Only current part of the file is kept in memory, so big objects
+    can be walked item by item with iter_object().
+    """
+    chunk_size = 1 << 16
+
+    def __init__(self, fh):
+        self.fh = fh
+        self.buf = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Read next chunk. Return False at the end of file"""
+        chunk = self.fh.read(self.chunk_size)
+        if chunk == "":
+            return False
+        # Forget already parsed text
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip spaces and return next symbol or "" at the end of file"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, symbols: str) -> str:
+        symbol = self.peek()
+        if symbol == "" or symbol not in symbols:
+            raise json.JSONDecodeError(f"expected one of '{symbols}'",
+                                       self.buf, self.pos)
+        self.pos += 1
+        return symbol
+
+    def value(self):
+        """Decode next JSON value"""
+        self.peek()
+        while True:
+            try:
+                (value, end) = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            if end == len(self.buf) and self._fill():
+                # Value (e.g. number) can be continued in the next chunk
+                continue
+            self.pos = end
+            return value
+
+    def iter_keys(self):
+        """Yield keys of JSON object. Value of each key must be read
+        with value() or iter_object() before the next key
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise json.JSONDecodeError("expected key",
+                                           self.buf, self.pos)
+            self.expect(":")
+            yield key
+            if self.expect(",}") == "}":
+                return
+
+    def iter_object(self):
+        """Yield (key, value) of JSON object item by item"""
+        for key in self.iter_keys():
+            yield (key, self.value())
+
+
+def record_digest_text(name: str, record_list_of_list) -> bytes:
+    """Canonical text of one record for the book checksum"""
+    return (json.dumps([name, record_list_of_list], ensure_ascii=False,
+                       separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def book_checksum(book: dict) -> str:
+    sha = hashlib.sha256()
+    for (name, record_list_of_list) in book.items():
+        sha.update(record_digest_text(name, record_list_of_list))
+    return "sha256:" + sha.hexdigest()
+
+
+def dumps_book(book: dict, checksum=None) -> str:
+    """Text of address book file of the current format version"""
+    if checksum is None:
+        checksum = book_checksum(book)
+    return json.dumps({"format": FORMAT_VERSION,
+                       "checksum": checksum,
+                       "book": book},
+                      indent=2, ensure_ascii=False)
+
+
+class BookFile:
+    """Address book file of any format version.
+
+    Header is read on creation, records are read by iteration.
+    A file with the current format version and checksum was written by
+    the application, so is_trusted is true; is_verified() tells after
+    iteration whether records match the checksum.
+    """
+
+    def __init__(self, fh):
+        self.reader = JsonReader(fh)
+        self.keys = self.reader.iter_keys()
+        self.format = 1
+        self.checksum = None
+        self.sha = hashlib.sha256()
+        # The first record of version 1 file which was read with header
+        self.first = None
+        self.in_book = False
+        for key in self.keys:
+            if key == "book" and self.reader.peek() == "{":
+                self.in_book = True
+                break
+            value = self.reader.value()
+            if key == "format" and isinstance(value, int):
+                self.format = value
+            elif key == "checksum" and isinstance(value, str):
+                self.checksum = value
+            else:
+                # Version 1: name of the first record
+                self.first = (key, value)
+                break
+
+    @property
+    def is_trusted(self) -> bool:
+        return self.format == FORMAT_VERSION and self.checksum is not None
+
+    def is_verified(self) -> bool:
+        return self.checksum == "sha256:" + self.sha.hexdigest()
+
+    @staticmethod
+    def as_record(name: str, record_list_of_list) -> tuple:
+        return (name,) + tuple((pair[0], pair[1])
+                               for pair in record_list_of_list)
+
+    def __iter__(self):
+        if self.in_book:
+            for (name, record_list_of_list) in self.reader.iter_object():
+                self.sha.update(record_digest_text(name, record_list_of_list))
+                yield self.as_record(name, record_list_of_list)
+            for __ in self.keys:
+                self.reader.value() # skip unknown keys after book
+            return
+        if self.first is not None:
+            yield self.as_record(*self.first)
+        for name in self.keys:
+            yield self.as_record(name, self.reader.value())
+
+
+def iter_records(fh):
+    """Yield ("Name", ("Phone", "111-22-33"), ...) for each record of
+    address book file
+    """
+    return iter(BookFile(fh))
+
+
+def write_atomically(pathfile: Path, text: str):
+    """Write file via temporary one, so pathfile is either old or new"""
+    tmp_pathfile = pathfile.with_name(pathfile.name + ".tmp")
+    with open(tmp_pathfile, "w") as fh:
+        fh.write(text)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp_pathfile, pathfile)
+
+
+class Storage(ABC):
+    """Persistence of AddressBook"""
+
+    def create_backend(self):
+        """Backend for AddressBook which is loaded by this storage"""
+        return MemoryBackend()
+
+    @abstractmethod
+    def load(self, ab):
+        """Load records into empty AddressBook"""
+
+    @abstractmethod
+    def save(self, ab):
+        """Save changes of AddressBook made after load/save"""
+
+
+class JsonStorage(Storage):
+    """Address book file (snapshot) with append-only journal of changes.
+
+    Journal is a text file near the snapshot. The first line binds it
+    to the snapshot checksum, each next line is a JSON change:
+        {"put": "Name", "record": [["Phone", "111-22-33"], ...]}
+        {"del": "Name"}
+    Save appends changed records to the journal. When the journal
+    becomes big, the whole book is written to a new snapshot.
+    """
+    # Journal bigger than snapshot * compact_ratio is compacted
+    compact_ratio = 0.5
+
+    def __init__(self, pathfile: Path):
+        self.pathfile = Path(pathfile)
+        self.journal_pathfile = self.pathfile.with_name(
+                                    self.pathfile.name + ".journal")
+        # Checksum of the snapshot if it is in the current format
+        self.checksum = None
+        self.snapshot_size = 0
+        # Size of the journal bound to the snapshot or None
+        self.journal_size = None
+
+    def load(self, ab):
+        """Load snapshot and replay journal into empty AddressBook"""
+        try:
+            self._load_snapshot(ab, trusted=True)
+        except (ValueError, TypeError, IndexError, AttributeError):
+            # File was edited by hand and its values can not be read
+            # without validation (e.g. birthday 31.02.1990 or phone
+            # written as number)
+            ab._clear()
+            self.checksum = None
+            self._load_snapshot(ab, trusted=False)
+        self.snapshot_size = os.path.getsize(self.pathfile)
+        if self.checksum is not None:
+            self._replay(ab)
+        ab.changes.clear()
+        ab.is_modified = False
+
+    def _load_snapshot(self, ab, trusted: bool):
+        with open(self.pathfile, "r") as fh:
+            book = BookFile(fh)
+            # File written by application is loaded without validation
+            is_trusted = trusted and book.is_trusted
+            ab.load(book, trusted=is_trusted)
+            if is_trusted and not book.is_verified():
+                # File was edited by hand
+                ab.validate()
+            if book.is_trusted:
+                # Journal is bound to the checksum written in the file,
+                # so changes saved before a hand edit are not lost
+                self.checksum = book.checksum
+
+    def _replay(self, ab):
+        try:
+            with open(self.journal_pathfile, "r") as fh:
+                lines = iter(fh)
+                line = next(lines, "")
+                header = json.loads(line or "{}")
+                if header.get("snapshot") != self.checksum:
+                    return # journal of other snapshot
+                size = len(line.encode("utf-8"))
+                for line in lines:
+                    try:
+                        change = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Broken last line: change was not saved and
+                        # journal must be rewritten on the next save
+                        return
+                    size += len(line.encode("utf-8"))
+                    if "del" in change:
+                        if change["del"] in ab:
+                            del ab[change["del"]]
+                    elif "put" in change:
+                        ab.load(((change["put"],) + tuple(
+                            (pair[0], pair[1]) for pair in change["record"]),))
+        except (FileNotFoundError, ValueError):
+            return
+        self.journal_size = size
+
+    def save(self, ab):
+        """Save changes of AddressBook made after load/save"""
+        if self.checksum is None or self.journal_size is None \
+                or self.journal_size > self.snapshot_size * self.compact_ratio \
+                or not self.journal_pathfile.exists():
+            self.compact(ab)
+            return
+        text = ""
+        for (name, is_removed) in ab.changes.items():
+            if is_removed:
+                text += json.dumps({"del": name}, ensure_ascii=False) + "\n"
+            if name in ab:
+                text += json.dumps({"put": name,
+                                    "record": ab.JSON_record(name)},
+                                   ensure_ascii=False) + "\n"
+        with open(self.journal_pathfile, "a") as fh:
+            fh.write(text)
+            fh.flush()
+            os.fsync(fh.fileno())
+        self.journal_size += len(text.encode("utf-8"))
+        ab.changes.clear()
+
+    def compact(self, ab):
+        """Write the whole book to a new snapshot and start new journal"""
+        book = ab.JSON_helper()
+        checksum = book_checksum(book)
+        write_atomically(self.pathfile, dumps_book(book, checksum))
+        # Journal of the old snapshot is ignored even if it is
+        # not rewritten because of crash
+        header = json.dumps({"snapshot": checksum}) + "\n"
+        write_atomically(self.journal_pathfile, header)
+        self.checksum = checksum
+        self.snapshot_size = os.path.getsize(self.pathfile)
+        self.journal_size = len(header.encode("utf-8"))
+        ab.changes.clear()
@@ -0,0 +1,48 @@
+"""Transliteration of Ukrainian text to Latin (national standard,
+Resolution of the Cabinet of Ministers of Ukraine No. 55 of 2010)
+
+Author: Dmytro Tarasiuk
+URL: https://github.com/RoyBebru/addressbook
+Email: RoyBebru@gmail.com
+License: MIT
+"""
+
+
+import re
+
+
+APOSTROPHES = "'’ʼ`"
+
+# Letters in the start of word
+INITIAL = {"є": "ye", "ї": "yi", "й": "y", "ю": "yu", "я": "ya"}
+pattern_initial = re.compile(r"(?<![\w" + APOSTROPHES + r"])([єїйюя])")
+
+# Letters in other positions. Soft sign is omitted
+LETTERS = {
+    "а": "a", "б": "b", "в": "v", "г": "h", "ґ": "g", "д": "d", "е": "e",
+    "є": "ie", "ж": "zh", "з": "z", "и": "y", "і": "i", "ї": "i", "й": "i",
+    "к": "k", "л": "l", "м": "m", "н": "n", "о": "o", "п": "p", "р": "r",
+    "с": "s", "т": "t", "у": "u", "ф": "f", "х": "kh", "ц": "ts", "ч": "ch",
+    "ш": "sh", "щ": "shch", "ь": "", "ю": "iu", "я": "ia"}
+# Apostrophe is omitted too
+TABLE = str.maketrans({**LETTERS, **dict.fromkeys(APOSTROPHES)})
+pattern_ukrainian = re.compile("[" + "".join(LETTERS) + "]", re.IGNORECASE)
+
+
+def has_ukrainian(text: str) -> bool:
+    return pattern_ukrainian.search(text) is not None
+
+
+def translit_key(text: str) -> str:
+    """Lowercase Latin search key of Ukrainian or Latin text:
+    'Щириця' -> 'shchyrytsia', "Shchyryts'ia" -> 'shchyrytsia'
+    """
+    text = pattern_initial.sub(lambda m: INITIAL[m.group(1)], text.lower())
+    # "зг" is "zgh" to differ from "zh" of "ж"
+    return text.replace("зг", "zgh").translate(TABLE)
+
+
+if __name__ == "__main__":
+    for text in ("Щириця", "Згурський Юрій", "Їжакевич", "Знам'янка",
+                 "Короп'є", "Shchyrytsia"):
+        print(text, translit_key(text))
@@ -0,0 +1,15 @@
+import pytest
+
+from notabene.addressbook import AddressBook
+from notabene.sqlitestorage import SqliteStorage
+
+
+@pytest.fixture(params=("memory", "sqlite"))
+def make_book(request, tmp_path):
+    """make_book(records) returns AddressBook with memory or SQLite backend"""
+    def make(records=()):
+        if request.param == "memory":
+            return AddressBook(records)
+        storage = SqliteStorage(tmp_path / "test.db")
+        return AddressBook(records, backend=storage.create_backend())
+    return make
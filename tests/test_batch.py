@@ -0,0 +1,18 @@
+from notabene import main
+from notabene.addressbook import AddressBook
+from notabene.selection import Selection
+from notabene.storage import JsonStorage
+
+
+def test_skipped_commands_are_not_counted(tmp_path, capsys):
+    def box(): pass
+    box.ab = AddressBook()
+    box.ab_fit = Selection(box.ab.keys())
+    box.ab_fit_to_fit = box.ab_fit
+    box.storage = JsonStorage(tmp_path / "test.abo")
+    lines = ["# comment", "", "add Іван Петренко", "@", "sort",
+             "show Петренко", "exit", "add Петро Іваненко"]
+    assert main.run_batch(box, lines) == 2
+    assert "Command is not available in batch mode: @" \
+        in capsys.readouterr().out
+    assert list(box.ab.keys()) == ["Іван Петренко"]
@@ -0,0 +1,29 @@
+from datetime import date
+
+import pytest
+
+from notabene.birthday import days_to_day
+
+
+RECORDS = (("Іван Петренко", ("Birthday", "29.02.1992")),
+           ("Петро Іваненко", ("Birthday", "28.02.1990")),
+           ("Оксана Коваль", ("Birthday", "01.01.1985")),
+           ("Анна Коваль", ("Birthday", "31.12.1985")),
+           ("Марія Шевчук", ("Birthday", "15.06.2000")),
+           ("Ян Ли",))
+
+
+@pytest.mark.parametrize("today", (date(2023, 2, 27), date(2024, 2, 27),
+                                   date(2023, 12, 30), date(2024, 6, 15)))
+@pytest.mark.parametrize("days", (0, 1, 2, 3, 100, 365))
+def test_upcoming_birthdays_match_full_scan(make_book, today, days):
+    ab = make_book(RECORDS)
+    ab.rename("Марія Шевчук", "Марія Бойко")
+    del ab["Петро Іваненко"]
+    expected = sorted(
+        (days_to_day(record.birthday.day, today), name)
+        for (name, record) in ab.data.items()
+        if record.birthday is not None
+        and days_to_day(record.birthday.day, today) <= days)
+    assert ab.upcoming_birthdays(days, today) == \
+        tuple(name for (__, name) in expected)
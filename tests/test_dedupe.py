@@ -0,0 +1,50 @@
+import pytest
+
+from notabene.addressbook import AddressBookException
+
+
+def test_same_words_without_confirmation_are_not_duplicates(make_book):
+    ab = make_book((("Олег Гуць", ("Phone", "050 111 22 33")),
+                    ("Oleh Huts", ("Phone", "067 444 55 66")),
+                    ("Мілена Щириця", ("Phone", "050 123 45 67")),
+                    ("Milena Shchyrytsia", ("Phone", "093 765 43 21")),
+                    ("Іван Петренко",),
+                    ("Петренко Іван",)))
+    assert ab.find_duplicates() == []
+
+
+def test_names_confirmed_by_phone_or_birthday(make_book):
+    ab = make_book((("Мілена Щириця", ("Phone", "+38 050 123-45-67")),
+                    ("Shchyrytsia Milena", ("Phone", "050 123 45 67")),
+                    ("Людмила Цибуленко", ("Birthday", "08.07.1988")),
+                    ("Людмила Цибуленка", ("Birthday", "08.07.1988")),
+                    ("Христина Вакуленко", ("Phone", "729-72-47"))))
+    assert ab.find_duplicates() == [
+        ("Мілена Щириця", "Shchyrytsia Milena"),
+        ("Людмила Цибуленко", "Людмила Цибуленка")]
+
+
+def test_different_birthdays_are_not_duplicates(make_book):
+    ab = make_book((("Тарас Шевченко", ("Phone", "050 123 45 67"),
+                     ("Birthday", "09.03.1814")),
+                    ("Шевченко Тарас", ("Phone", "050 123 45 67"),
+                     ("Birthday", "10.03.1814"))))
+    assert ab.find_duplicates() == []
+
+
+def test_merge(make_book):
+    ab = make_book((("Мілена Щириця", ("Phone", "+38 050 123-45-67")),
+                    ("Shchyrytsia Milena", ("Phone", "050 123 45 67"),
+                     ("Birthday", "01.02.1990"))))
+    assert ab.merge(ab.find_duplicates()[0]) == "Мілена Щириця"
+    assert list(ab.keys()) == ["Мілена Щириця"]
+    assert ab["Мілена Щириця"].as_tuple_of_tuples() == (
+        ("Phone", "+38 050 123-45-67"), ("Birthday", "01.02.1990"))
+
+
+def test_merge_of_different_birthdays_is_refused(make_book):
+    ab = make_book((("Тарас Шевченко", ("Birthday", "09.03.1814")),
+                    ("Шевченко Тарас", ("Birthday", "10.03.1814"))))
+    with pytest.raises(AddressBookException):
+        ab.merge(("Тарас Шевченко", "Шевченко Тарас"))
+    assert len(ab) == 2
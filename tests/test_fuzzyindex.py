@@ -0,0 +1,15 @@
+from notabene.fuzzyindex import FuzzyIndex
+
+
+def test_distance():
+    assert FuzzyIndex.distance("цибуленко", "цибуленка", 1) == 1
+    assert FuzzyIndex.distance("цибуленко", "цибулнеко", 1) == 1
+    assert FuzzyIndex.distance("цибуленко", "вакуленко", 1) == 2
+
+
+def test_exact_match_of_any_variant_wins(make_book):
+    # "O'Neil" matches "o'neil" exactly and "oneil" by transliteration
+    ab = make_book((("John Oneil",), ("John O'Neil",)))
+    assert sorted(ab.backend.fuzzy_matches("O'Neil")) \
+        == [(0, "John O'Neil"), (0, "John Oneil")]
+    assert ab.get_fuzzy("O'Neil") == ("John Oneil", "John O'Neil")
@@ -0,0 +1,68 @@
+import http.client
+import json
+import threading
+
+from notabene.addressbook import AddressBook
+from notabene.history import History
+from notabene.main import create_httpd
+from notabene.selection import Selection
+from notabene.sqlitestorage import SqliteStorage
+
+
+def test_command_with_sqlite_backend(tmp_path):
+    def box(): pass
+    box.storage = SqliteStorage(tmp_path / "test.db")
+    box.ab = AddressBook((("Іван Петренко", ("Phone", "050 123 45 67")),),
+                         backend=box.storage.create_backend())
+    box.ab_fit = Selection(box.ab.keys())
+    box.ab_fit_to_fit = box.ab_fit
+    httpd = create_httpd(box, port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = http.client.HTTPConnection(
+            "localhost", httpd.server_address[1], timeout=10)
+        connection.request("POST", "/",
+                           json.dumps({"command": "show Петренко"}),
+                           {"Content-Type": "application/json"})
+        answer = json.loads(connection.getresponse().read())
+        connection.close()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    assert [record["name"] for record in answer["records"]] \
+        == ["Іван Петренко"]
+
+
+def test_events_replay_history_after_first_answer():
+    def box(): pass
+    box.ab = AddressBook((("Іван Петренко",),))
+    box.ab_fit = Selection(box.ab.keys())
+    box.ab_fit_to_fit = box.ab_fit
+    box.history = History(("all",))
+    httpd = create_httpd(box, port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = http.client.HTTPConnection(
+            "localhost", httpd.server_address[1], timeout=10)
+        connection.request("POST", "/", json.dumps({"firstly": 1}),
+                           {"Content-Type": "application/json"})
+        answer = json.loads(connection.getresponse().read())
+        # Line is added before the page opens the event stream
+        box.history.append("show Петренко")
+        connection.request("GET",
+                           f"/events?since={answer['history_seq']}")
+        response = connection.getresponse()
+        # The first events are counters
+        lines = [response.readline().decode("utf-8")]
+        while lines[-1] != "event: history\n":
+            lines.append(response.readline().decode("utf-8"))
+        lines.append(response.readline().decode("utf-8"))
+        connection.close()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    assert answer["history"] == ["all"] and answer["history_seq"] == 1
+    assert lines[-3:] == ["id: 2\n", "event: history\n",
+                          'data: "show Петренко"\n']
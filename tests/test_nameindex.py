@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from notabene.addressbook import AddressBookException
+from notabene.main import cmd_add
+from notabene.nameindex import NameIndex
+from notabene.selection import Selection
+
+
+def test_equal_by_combination(make_book):
+    ab = make_book((("Іван Петренко",), ("Анна Анна",)))
+    assert ab.is_any_equal_by_combination("петренко іван")
+    # Words of key are among words of name with the same length
+    assert ab.is_any_equal_by_combination("Анна Ганн")
+    assert not ab.is_any_equal_by_combination("Іван Петренко Q")
+
+
+def test_long_name_is_verified_before_duplicate_check(make_book):
+    def box(): pass
+    box.ab = make_book((("Іван Петренко",),))
+    box.ab_fit = Selection(box.ab.keys())
+    box.ab_fit_to_fit = box.ab_fit
+    lookups = []
+    box.ab.backend.has_equal_by_combination = lookups.append
+    name = " ".join("Слово" + "в" * i for i in range(40))
+    assert cmd_add(name, box).startswith("AddressBook Error: extra symbol")
+    with pytest.raises(AddressBookException):
+        box.ab.rename("Іван Петренко", name)
+    # Incorrect name is rejected without lookup of word subsets
+    assert lookups == []
+
+
+def test_long_name_lookup_is_polynomial(make_book):
+    ab = make_book((("Іван Петренко",),))
+    name = " ".join("Слово" + "в" * i for i in range(40))
+    # Only subsets up to max_words words: 40 + 40*39/2 + 40*39*38/6
+    assert len(NameIndex.combination_keys(name)) == 40 + 780 + 9880
+    assert not ab.is_any_equal_by_combination(name)
+
+
+def test_similar_candidates_match_full_scan(make_book):
+    ab = make_book((("Іван Петренко",), ("Петро Іваненко",), ("Ян Ли",),
+                    ("Щириця",), ("Shchyrytsia Anna",), ("Анна-Марія",),
+                    ("Ь",)))
+    for name in ("Іван", "петренко іваненко", "Іваненкович", "Ли",
+                 "Ян Лисенко", "Shchyryts", "щириця", "марія анна-марія",
+                 "Ann", "Ь ю", "Х" * 1000):
+        found = ab.get_similar(name)
+        full_scan = ab.backend.similar_candidates
+        ab.backend.similar_candidates = lambda name: None
+        try:
+            assert found == ab.get_similar(name), name
+        finally:
+            ab.backend.similar_candidates = full_scan
+
+
+def test_long_word_substrings_are_bounded(make_book):
+    ab = make_book((("Іван Петренко",),))
+    # Only substrings not longer than "петренко" are looked up
+    assert len(NameIndex.substrings(("ж" * 2000,), 8)) == 9
+    assert ab.get_similar("Іванпетренко" * 150) == ("Іван Петренко",)
+
+
+def test_word_with_many_trigrams_is_found(make_book):
+    rnd = random.Random(1)
+    word = "".join(rnd.choice("абвгдежзийклмнопрстуфхцчшщюя")
+                   for __ in range(530))
+    ab = make_book(((word.capitalize(),),))
+    assert len(set(NameIndex.iter_grams(word[:520]))) > 500
+    assert ab.get_similar(word[:520]) == (word.capitalize(),)
+    assert ab.get_similar_by_phone("5" + "0123456789" * 60) == ()
@@ -0,0 +1,73 @@
+import random
+import re
+
+import pytest
+
+from notabene.phone import Phone, PhoneException
+
+PARTS = ("+", "38", "380", "(", ")", "050", "12345", "123456", "1", "12",
+         " ", "  ", "\t", "-", " - ", "x", "٣", "²")
+
+
+@pytest.mark.parametrize("number", ("11-351", "+380(050) 123-77-11",
+                                    "12121212121", "050 123 - 45 - 67"))
+def test_correct_number(number):
+    assert Phone(number).digits == Phone.get_digits_from_str(number)
+
+
+@pytest.mark.parametrize(("number", "error"), (
+    ("abc", "incorrect number 'abc'"),
+    ("x 050 123 45 67", "extra symbol(s) 'x' in the start"),
+    ("050 123 45 67 x", "extra symbol(s) ' x' in the end"),
+    ("12-34", "number '12-34' is very short to be correct")))
+def test_incorrect_number(number, error):
+    with pytest.raises(PhoneException) as e:
+        Phone(number)
+    assert e.value.args[0] == error
+
+
+def reference_phone(text: str):
+    """Normalized number or None: validator of the first release of
+    Phone, it is kept here as is to check the current one
+    """
+    phone = " ".join(str(text).split())
+    phone = phone.replace(" - ", "-").replace(" -", "-").replace("- ", "-")
+    m = re.search(r"(?:\+\d{1,3})?\s*(?:\(\d{2,5}\)|\d{2,5})?"
+                  r"\s*\d{1,3}(?:\s*-)?\s*\d{1,3}(?:\s*-)?\s*\d{1,3}", phone)
+    if m is None or m.start() != 0 or m.end() != len(phone) \
+            or sum(map(lambda x: x.isdigit(), phone)) < 5:
+        return None
+    return phone
+
+
+def test_fuzz_text_is_accepted_or_rejected():
+    """Any text is accepted or rejected like by the reference validator
+    and accepted number is normalized in the same way
+    """
+    rnd = random.Random(1)
+    for __ in range(10_000):
+        text = "".join(rnd.choice(PARTS) for __ in range(rnd.randint(0, 10)))
+        expected = reference_phone(text)
+        try:
+            phone = Phone(text)
+        except PhoneException:
+            assert expected is None, text
+            continue
+        assert phone.value == expected, text
+        assert phone.digits == "".join(filter(str.isdigit, expected))
+
+
+@pytest.mark.parametrize("text", ("1" + " " * 4000 + "x",
+                                  "1 " * 2000 + "x",
+                                  "+1 (12) 1-1-" * 400 + "x"))
+def test_long_text_is_normalized_before_search(text):
+    # Spaces are normalized before the pattern is searched, so the
+    # pattern can not backtrack over space runs
+    normalized = Phone.normalize_phone(text)
+    assert "  " not in normalized
+    assert " -" not in normalized and "- " not in normalized
+    with pytest.raises(PhoneException) as e:
+        Phone(text)
+    with pytest.raises(PhoneException) as reference:
+        Phone("050 123 45 67").verify(normalized)
+    assert e.value.args == reference.value.args
@@ -0,0 +1,34 @@
+from datetime import date
+import os
+
+from notabene.addressbook import AddressBook
+
+
+RECORDS = (("Іван Петренко", ("Phone", "111-22-33"),
+            ("Birthday", "01.02.1990")),
+           ("Петро Іваненко", ("Phone", "222-33-44")),
+           ("Оксана Коваль",))
+
+
+def test_report_cache_follows_changes(make_book):
+    ab = make_book(RECORDS)
+    before = ab.search_document("Іван Петренко", 1)
+    assert before == ab.report("Іван Петренко")
+    ab["Іван Петренко"].add((("Phone", "333-44-55"),))
+    after = ab.search_document("Іван Петренко", 1)
+    assert after != before and "333-44-55" in after
+    ab.rename("Іван Петренко", "Іван Петрик")
+    assert "333-44-55" in ab.report("Іван Петрик")
+
+
+def test_report_cache_has_no_days_left():
+    ab = AddressBook(RECORDS)
+    record = ab["Іван Петренко"]
+    text = ab.report()
+    assert ab.report() == text
+    assert record.report_parts(4) == (
+        os.linesep + "    Phone: 111-22-33"
+        + os.linesep + "    Birthday: 01.02.1990 (+", " days left)")
+    days_left = record.birthday.days_to_birthday(date.today())
+    assert f"01.02.1990 (+{days_left} days left)" in text
+    assert ab.search_document("Оксана Коваль", 3) == "#3 Name: Оксана Коваль"
@@ -0,0 +1,102 @@
+from datetime import date
+
+import pytest
+
+from notabene import main
+from notabene.addressbook import AddressBook
+from notabene.birthday import BirthdayException
+from notabene.storage import JsonStorage
+
+
+@pytest.mark.parametrize("birthday", ("31.02.1990", "1990"))
+def test_edited_trusted_file_is_validated(tmp_path, birthday):
+    pathfile = tmp_path / "test.abo"
+    JsonStorage(pathfile).compact(
+        AddressBook((("Іван Петренко", ("Birthday", "09.03.1990")),)))
+    pathfile.write_text(pathfile.read_text().replace("09.03.1990", birthday))
+    with pytest.raises(BirthdayException):
+        JsonStorage(pathfile).load(AddressBook())
+
+
+def test_trusted_file_is_loaded(tmp_path):
+    pathfile = tmp_path / "test.abo"
+    JsonStorage(pathfile).compact(
+        AddressBook((("Іван Петренко", ("Birthday", "09.03.1990")),)))
+    ab = AddressBook()
+    storage = JsonStorage(pathfile)
+    storage.load(ab)
+    assert ab["Іван Петренко"].birthday.value == "09.03.1990"
+    assert storage.checksum is not None
+
+
+def test_json_book_is_imported_to_sqlite_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "ADDRESSBOOK_PATHFILE", tmp_path / "test.abo")
+    monkeypatch.setattr(main, "ADDRESSBOOK_DB_PATHFILE", tmp_path / "test.db")
+    JsonStorage(main.ADDRESSBOOK_PATHFILE).compact(
+        AddressBook((("Іван Петренко", ("Phone", "050 123 45 67")),)))
+
+    box = main.create_box(True)
+    assert list(box.ab.keys()) == ["Іван Петренко"]
+    del box.ab["Іван Петренко"]
+    box.ab.is_modified = True
+    main.dump_addressbook(box)
+    box.storage.db.close()
+
+    box = main.create_box(True)
+    assert len(box.ab) == 0
+
+
+def test_journal_is_replayed_after_hand_edit(tmp_path):
+    pathfile = tmp_path / "test.abo"
+    storage = JsonStorage(pathfile)
+    ab = AddressBook((("Іван Петренко", ("Phone", "050 123 45 67")),))
+    storage.compact(ab)
+    ab["Оксана Коваль"] = (("Phone", "067 765 43 21"),)
+    storage.save(ab)
+
+    # Comment is added to the snapshot by hand
+    pathfile.write_text(pathfile.read_text().replace(
+        '"050 123 45 67"\n      ]',
+        '"050 123 45 67"\n      ],\n      [\n        "Comment",\n'
+        '        "edited"\n      ]'))
+    ab = AddressBook()
+    JsonStorage(pathfile).load(ab)
+    assert list(ab.keys()) == ["Іван Петренко", "Оксана Коваль"]
+    assert ab["Іван Петренко"].as_tuple_of_tuples() == (
+        ("Phone", "050 123 45 67"), ("Comment", "edited"))
+
+
+def test_edited_trusted_file_with_number_is_loaded(tmp_path):
+    pathfile = tmp_path / "test.abo"
+    JsonStorage(pathfile).compact(
+        AddressBook((("Іван Петренко", ("Phone", "050 123 45 67")),)))
+    # Phone is written by hand as JSON number
+    pathfile.write_text(pathfile.read_text().replace('"050 123 45 67"',
+                                                     "5012345"))
+    ab = AddressBook()
+    JsonStorage(pathfile).load(ab)
+    assert ab["Іван Петренко"].as_tuple_of_tuples() == (("Phone", "5012345"),)
+
+
+def test_fallback_load_keeps_indexes_consistent(tmp_path, make_book):
+    pathfile = tmp_path / "test.abo"
+    JsonStorage(pathfile).compact(AddressBook((
+        ("Іван Петренко", ("Phone", "050 123 45 67"),
+         ("Birthday", "09.03.1990")),
+        ("Оксана Коваль", ("Birthday", "01.01.1985")))))
+    # The first record is loaded as trusted before the error
+    pathfile.write_text(pathfile.read_text().replace('"01.01.1985"',
+                                                     '"1.1.1985"'))
+    ab = make_book()
+    clears = []
+    ab._clear = lambda clear=ab._clear: clears.append(clear())
+    JsonStorage(pathfile).load(ab)
+    # Book was loaded again with validation
+    assert len(clears) == 1
+    assert list(ab.keys()) == ["Іван Петренко", "Оксана Коваль"]
+    assert ab.get_similar("Петренко") == ("Іван Петренко",)
+    assert ab.get_similar_by_phone("1234567") == ("Іван Петренко",)
+    assert ab.upcoming_birthdays(365, date(2024, 3, 1)) == (
+        "Іван Петренко", "Оксана Коваль")
+    assert ab.is_any_equal_by_combination("Петренко Іван")
+    assert not ab.is_modified and len(ab.changes) == 0